@@ -16,9 +16,9 @@ def setup_gcp_credentials():
         # Write credentials to a file
         creds_path = Path("/tmp/gcp-credentials.json")
         try:
-            # Parse to validate JSON
-            creds_data = json.loads(creds_json)
-            creds_path.write_text(json.dumps(creds_data, indent=2))
+            # Parse to validate JSON, then write the secret through unchanged
+            json.loads(creds_json)
+            creds_path.write_text(creds_json)
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(creds_path)
             print("✅ Google Cloud credentials configured successfully")
         except json.JSONDecodeError as e:
@@ -58,11 +58,11 @@ if __name__ == "__main__":
     print("🎯 Ferris AI Travel Booking - Starting up...")
     print("=" * 60)
     
+    # Start Node.js server first so it boots while credentials are decoded
+    node_proc = start_node_server()
+    
     # Setup credentials
     setup_gcp_credentials()
     
-    # Start Node.js server
-    node_proc = start_node_server()
-    
     # Start FastAPI (this will replace current process)
     start_fastapi()
@@ -1,16 +1,181 @@
 from __future__ import annotations
+import asyncio
+import difflib
+import functools
+import re
+import sys
+from collections import OrderedDict
+from operator import itemgetter
 from typing import Dict, Any
 from .conversation_flow import (
     ConversationContext,
     resolve_date_input,
     parse_guest_count,
+    clamp_guest_count,
     ConversationState,
 )
 from .airbnb_scraper import search_airbnb
 from .ranker import rank_listings
-from .llm import LLMNotConfiguredError, generate_brand_response
 from .transport import get_transportation_options
 
+_LISTINGS_CACHE_SIZE = 4
+
+# Explicit party sizes: "4 people", "3-4 guests", "solo", "just me", "couple"
+_GUEST_RE = re.compile(
+    r'\b(?:(\d+)(?:\s*-\s*\d+)?\s*(?:people|guests|adults|persons?)|(solo|just me)|(couple))\b'
+)
+# "budget $900" outranks "under $300" wherever each appears in the message
+_BUDGET_RE = re.compile(r'(under|budget)\s*\$?(\d+)')
+_WORD_RE = re.compile(r"[a-z]+")
+_DIGIT_RE = re.compile(r"\d")
+_MONTHS = frozenset({
+    "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may",
+    "jun", "june", "jul", "july", "aug", "august", "sep", "sept", "september",
+    "oct", "october", "nov", "november", "dec", "december",
+})
+_WEEKEND_WORDS = frozenset({"weekend", "weekends", "flexible"})
+_GUEST_WORDS = frozenset({"people", "guests", "person", "persons", "adults", "group", "family"})
+
+_REFINE_CUES = {
+    "cheaper": ("cheaper", "budget", "less expensive", "too expensive"),
+    "bigger": ("bigger", "more beds", "more space"),
+    "different": ("different", "something else", "another", "other option"),
+}
+# One scan for every refinement cue; the named group that matched is the
+# refinement type. Types rank in table order (cheaper > bigger > different),
+# whatever order their cues appear in the message.
+_REFINE_RE = re.compile(
+    "|".join(
+        rf"(?P<{kind}>\b(?:{'|'.join(re.escape(cue) for cue in cues)})\b)"
+        for kind, cues in _REFINE_CUES.items()
+    )
+)
+_REFINE_RANK = {kind: rank for rank, kind in enumerate(_REFINE_CUES)}
+
+def _refinement_type(msg: str) -> str | None:
+    """Highest-priority refinement cued anywhere in msg"""
+    best = None
+    for match in _REFINE_RE.finditer(msg):
+        kind = match.lastgroup
+        if best is None or _REFINE_RANK[kind] < _REFINE_RANK[best]:
+            best = kind
+            if _REFINE_RANK[best] == 0:
+                break
+    return best
+
+# (sort key, descending) per refinement; "different" keeps search order
+_REFINE_SORT_KEYS = {
+    "cheaper": (itemgetter("price_per_night"), False),
+    "bigger": (itemgetter("beds"), True),
+}
+# (new pick, previous itinerary, new total) -> trade-off blurb; "different"
+# has no metric to compare
+_REFINE_TRADEOFFS = {
+    "cheaper": lambda best, previous, total: f"${previous['total_price'] - total} cheaper",
+    "bigger": lambda best, previous, total: f"{best['beds']} beds (vs {previous['stay']['beds']})",
+}
+
+_ACTIVITY_DEFAULTS = {
+    "beach": "San Diego",
+    "ski": "Lake Tahoe",
+    "wine": "Napa",
+    "hiking": "Big Sur",
+    "city": "San Francisco",
+    "relaxing": "Carmel",
+}
+_ACTIVITY_CONTEXT = {
+    "beach": "for a breezy beach escape",
+    "ski": "for your ski weekend",
+    "wine": "for easy vineyard hopping",
+    "hiking": "near the trailheads",
+    "city": "in the heart of the action",
+    "relaxing": "where you can truly unwind",
+}
+_UPBEAT_INTRO = {
+    "relaxing": "This is going to feel so restorative!",
+    "ski": "Fresh powder and good vibes coming right up!",
+    "wine": "Tasting rooms and sunshine? Say no more!",
+}
+
+_DESTINATIONS = (
+    "san diego", "lake tahoe", "tahoe", "napa", "big sur", "santa cruz",
+    "malibu", "monterey", "yosemite", "mammoth", "joshua tree", "sonoma",
+    "san francisco", "los angeles", "santa barbara", "carmel", "mendocino",
+    "ojai", "healdsburg", "paso robles", "sequoia", "oakland", "tahoe city", "big bear",
+    "cancun", "riviera maya", "tulum", "playa del carmen", "sf", "la",
+)
+# Aliases whose display name isn't just the title-cased alias
+_CANONICAL_DESTINATIONS = {
+    "tahoe": "Lake Tahoe",
+    "sf": "San Francisco",
+    "la": "Los Angeles",
+    "cancun": "Cancun",
+    "riviera maya": "Cancun",
+    "tulum": "Cancun",
+    "playa del carmen": "Cancun",
+}
+# Every alias resolved to its display name up front, so a match is one lookup;
+# interned so every alias of a place hands out the same string object
+_DEST_ALIASES = {
+    dest: sys.intern(_CANONICAL_DESTINATIONS.get(dest) or dest.title()) for dest in _DESTINATIONS
+}
+# Longest aliases first so "tahoe city" beats "tahoe" at the same position;
+# word boundaries keep "sf"/"la" from matching inside other words
+_DEST_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(dest) for dest in sorted(_DEST_ALIASES, key=len, reverse=True))
+    + r")\b"
+)
+
+# Short aliases ("sf", "la", "napa") are too close to ordinary words to fuzz.
+# Candidates are grouped by (word count, first letter): a phrase is only compared
+# with aliases of the same shape, so "the city" never meets "tahoe city"
+_FUZZY_DEST_INDEX: Dict[tuple[int, str], list[str]] = {}
+for _alias in _DEST_ALIASES:
+    if len(_alias) >= 5:
+        _FUZZY_DEST_INDEX.setdefault((_alias.count(" ") + 1, _alias[0]), []).append(_alias)
+_FUZZY_WORD_COUNTS = sorted({words for words, _ in _FUZZY_DEST_INDEX})
+# Windows starting with one of these are filler ("in the city"), not a place name
+_FUZZY_STOP_WORDS = frozenset({"the", "in", "a", "an", "at", "to", "of", "for", "on", "and", "my", "our"})
+# One slip in a short single word is a typo ("tahow"); multi-word phrases share
+# whole words with ordinary speech ("big beer"), so they must be closer
+_FUZZY_CUTOFF_SINGLE = 0.8
+_FUZZY_CUTOFF_MULTI = 0.9
+
+def _fuzzy_destination(msg: str) -> str | None:
+    """Closest destination to a phrase in msg with the same word count, if close enough"""
+    words = _WORD_RE.findall(msg)
+    best_alias, best_score = None, 0.0
+    for count in _FUZZY_WORD_COUNTS:
+        cutoff = _FUZZY_CUTOFF_SINGLE if count == 1 else _FUZZY_CUTOFF_MULTI
+        for start in range(len(words) - count + 1):
+            first = words[start]
+            if first in _FUZZY_STOP_WORDS:
+                continue
+            candidates = _FUZZY_DEST_INDEX.get((count, first[0]))
+            if not candidates:
+                continue
+            phrase = " ".join(words[start:start + count])
+            if len(phrase) < 5:
+                continue
+            match = difflib.get_close_matches(phrase, candidates, n=1, cutoff=cutoff)
+            if match:
+                score = difflib.SequenceMatcher(None, phrase, match[0]).ratio()
+                if score > best_score:
+                    best_alias, best_score = match[0], score
+    return _DEST_ALIASES[best_alias] if best_alias else None
+
+@functools.lru_cache(maxsize=None)
+def _get_llm():
+    """Import the LLM client on first use; vertexai is slow to import at boot"""
+    from . import llm
+    return llm
+
+@functools.lru_cache(maxsize=None)
+def _llm_ready() -> bool:
+    """Whether Gemini is configured; checked once per process"""
+    return _get_llm().is_configured()
+
 def process_message(message: str, session: Any) -> Dict[str, Any]:
     """
     Enhanced agent with conversation flow
@@ -18,102 +183,105 @@ def process_message(message: str, session: Any) -> Dict[str, Any]:
     session.last_user_message = message
     
     # Initialize conversation context if not exists
-    if not hasattr(session, 'conversation_context'):
+    if getattr(session, 'conversation_context', None) is None:
         session.conversation_context = ConversationContext()
     
     context = session.conversation_context
     msg_lower = message.lower().strip()
     
     # Handle refinement requests
-    if context.state.value == "showing_result" and hasattr(session, 'last_itinerary'):
-        if any(word in msg_lower for word in ["cheaper", "budget", "less expensive", "too expensive"]):
-            return handle_refinement(session, "cheaper")
-        elif any(word in msg_lower for word in ["bigger", "more beds", "more space"]):
-            return handle_refinement(session, "bigger")
-        elif any(word in msg_lower for word in ["different", "something else", "another", "other option"]):
-            return handle_refinement(session, "different")
+    if context.state is ConversationState.SHOWING_RESULT and hasattr(session, 'last_itinerary'):
+        refinement_type = _refinement_type(msg_lower)
+        if refinement_type:
+            return handle_refinement(session, refinement_type)
     
     # Update context with new message and auto-complete missing info
-    update_context_from_message(context, message)
+    update_context_from_message(context, message, msg_lower, frozenset(_WORD_RE.findall(msg_lower)))
     auto_complete_missing_slots(context)
     
     # Ready to search immediately
     return execute_search(context, session)
 
-def update_context_from_message(context: ConversationContext, message: str):
-    """Extract and update slots from user message"""
-    msg = message.lower()
+def _process_message_locked(message: str, session: Any) -> Dict[str, Any]:
+    """process_message with the session's turn lock held, so same-session turns run one at a time"""
+    with session.turn_lock:
+        return process_message(message, session)
+
+async def process_message_async(message: str, session: Any) -> Dict[str, Any]:
+    """
+    Event-loop friendly entry point: the search and LLM calls block, so run the
+    whole turn in a worker thread and let other requests proceed meanwhile.
+    Turns for the same session are serialized on its turn lock; different
+    sessions still run in parallel.
+    """
+    return await asyncio.to_thread(_process_message_locked, message, session)
+
+def update_context_from_message(
+    context: ConversationContext,
+    message: str,
+    msg: str,
+    tokens: frozenset[str],
+):
+    """
+    Extract and update slots from user message.
+    msg is the already-lowercased message and tokens its alphabetic words.
+    """
     
     # Capture activity cues early to influence downstream defaults
-    activity = context.extract_activity(message)
+    activity = context.extract_activity(msg)
     if activity:
-        context.slots["activity"] = activity
+        context.slots.activity = activity
     
     # If we're waiting for custom dates or user entered something with numbers, try to parse as date
-    if context.waiting_for_custom_dates or (not context.slots["check_in"] and any(char.isdigit() for char in msg)):
+    if context.waiting_for_custom_dates or (not context.slots.check_in and _DIGIT_RE.search(msg)):
         # Check if it looks like a date input (has month name or numbers)
-        looks_like_date = any(month in msg for month in ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]) or "/" in msg or "-" in msg
+        looks_like_date = bool(tokens & _MONTHS) or "/" in msg or "-" in msg
         
         if looks_like_date:
             context.waiting_for_custom_dates = False
             try:
-                check_in, check_out = resolve_date_input(message)
-                context.slots["check_in"] = check_in
-                context.slots["check_out"] = check_out
+                context.set_dates(*resolve_date_input(message, msg))
                 return  # Exit early after parsing dates
             except Exception as e:
                 print(f"Date parsing failed: {e}")
                 # Continue to other parsing if date parsing fails
     
-    # Update destination - more comprehensive
-    destinations = [
-        "san diego", "lake tahoe", "tahoe", "napa", "big sur", "santa cruz",
-        "malibu", "monterey", "yosemite", "mammoth", "joshua tree", "sonoma",
-        "san francisco", "los angeles", "santa barbara", "carmel", "mendocino",
-        "ojai", "healdsburg", "paso robles", "sequoia", "oakland", "tahoe city", "big bear",
-        "cancun", "riviera maya", "tulum", "playa del carmen"
-    ]
-    for dest in destinations:
-        if dest in msg:
-            if dest == "tahoe":
-                context.slots["destination"] = "Lake Tahoe"
-            elif dest == "sf" or dest == "san francisco":
-                context.slots["destination"] = "San Francisco"
-            elif dest == "la" or dest == "los angeles":
-                context.slots["destination"] = "Los Angeles"
-            elif dest in {"cancun", "riviera maya", "tulum", "playa del carmen"}:
-                context.slots["destination"] = "Cancun"
-            else:
-                context.slots["destination"] = dest.title()
-            break
+    # Update destination - single pass over the message, leftmost mention wins
+    dest_match = _DEST_RE.search(msg)
+    if dest_match:
+        context.slots.destination = _DEST_ALIASES[dest_match.group(0)]
+    elif not context.slots.destination:
+        # No exact alias - tolerate typos like "monteray" or "san fransisco"
+        fuzzy_dest = _fuzzy_destination(msg)
+        if fuzzy_dest:
+            context.slots.destination = fuzzy_dest
 
-    if not context.slots["destination"] and "spring break" in msg:
-        context.slots["destination"] = "Cancun"
+    if not context.slots.destination and "spring break" in msg:
+        context.slots.destination = "Cancun"
     
     # Update dates with simple keywords
-    if any(word in msg for word in ["this weekend", "next weekend", "weekend", "flexible"]):
-        check_in, check_out = resolve_date_input(message)
-        context.slots["check_in"] = check_in
-        context.slots["check_out"] = check_out
-    
-    # Update guests - comprehensive extraction
-    if any(word in msg for word in ["people", "guests", "person", "just me", "solo", "couple", "group", "family"]):
-        context.slots["guests"] = parse_guest_count(message)
-    
-    # Also check for standalone numbers that might be guest count
-    import re
-    if context.slots["guests"] is None:
-        numbers = re.findall(r'\b(\d+)\s*(?:people|guests|adults|persons?)\b', msg)
-        if numbers:
-            context.slots["guests"] = int(numbers[0])
+    if tokens & _WEEKEND_WORDS:
+        context.set_dates(*resolve_date_input(message, msg))
+    
+    # Update guests - one scan for explicit counts, keyword heuristics otherwise
+    guest_match = _GUEST_RE.search(msg)
+    if guest_match:
+        count, solo, _couple = guest_match.groups()
+        context.slots.guests = clamp_guest_count(int(count)) if count else 1 if solo else 2
+    elif tokens & _GUEST_WORDS:
+        context.slots.guests = parse_guest_count(message, msg)
     
     # Update budget
-    budget_match = re.search(r'under\s*\$?(\d+)', msg)
-    if budget_match:
-        context.slots["budget_max"] = float(budget_match.group(1))
-    budget_match2 = re.search(r'budget\s*\$?(\d+)', msg)
-    if budget_match2:
-        context.slots["budget_max"] = float(budget_match2.group(1))
+    budget = None
+    for budget_match in _BUDGET_RE.finditer(msg):
+        cue, amount = budget_match.groups()
+        if cue == "budget":
+            budget = amount
+            break
+        if budget is None:
+            budget = amount
+    if budget:
+        context.slots.budget_max = float(budget)
 
 
 def auto_complete_missing_slots(context: ConversationContext) -> None:
@@ -122,25 +290,14 @@ def auto_complete_missing_slots(context: ConversationContext) -> None:
     Placeholder for future ML-powered completion.
     """
     # Destination defaults by activity, falls back to a popular choice
-    activity_defaults = {
-        "beach": "San Diego",
-        "ski": "Lake Tahoe",
-        "wine": "Napa",
-        "hiking": "Big Sur",
-        "city": "San Francisco",
-        "relaxing": "Carmel",
-    }
+    if not context.slots.destination:
+        context.slots.destination = _ACTIVITY_DEFAULTS.get(context.slots.activity) or "San Diego"
     
-    if not context.slots["destination"]:
-        context.slots["destination"] = activity_defaults.get(context.slots.get("activity")) or "San Diego"
+    if not context.slots.check_in or not context.slots.check_out:
+        context.set_dates(*resolve_date_input("next weekend"))
     
-    if not context.slots["check_in"] or not context.slots["check_out"]:
-        check_in, check_out = resolve_date_input("next weekend")
-        context.slots["check_in"] = check_in
-        context.slots["check_out"] = check_out
-    
-    if not context.slots["guests"]:
-        context.slots["guests"] = 2
+    if not context.slots.guests:
+        context.slots.guests = 2
     
     context.state = ConversationState.READY_TO_SEARCH
 
@@ -148,7 +305,7 @@ def get_simulated_profile(session: Any) -> Dict[str, Any]:
     """
     Placeholder insights until real historical trip modeling is wired up.
     """
-    if not hasattr(session, "profile"):
+    if getattr(session, "profile", None) is None:
         session.profile = {
             "avg_budget": 950,
             "travel_party": "two close friends",
@@ -157,21 +314,45 @@ def get_simulated_profile(session: Any) -> Dict[str, Any]:
         }
     return session.profile
 
+def _search_cached(context: ConversationContext, session: Any) -> list[Dict[str, Any]]:
+    """
+    Return listings for the current slots, reusing the session's recent results
+    so refinements and switching back to an earlier query skip the fetch.
+    """
+    key = (
+        context.slots.destination,
+        context.slots.check_in,
+        context.slots.check_out,
+        context.slots.guests,
+    )
+    cache = getattr(session, "listings_cache", None)
+    if cache is None:
+        cache = session.listings_cache = OrderedDict()
+    elif key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    listings = search_airbnb(
+        destination=key[0],
+        check_in=key[1],
+        check_out=key[2],
+        guests=key[3],
+    )
+    cache[key] = listings
+    if len(cache) > _LISTINGS_CACHE_SIZE:
+        cache.popitem(last=False)
+    return listings
+
 def execute_search(context: ConversationContext, session: Any) -> Dict[str, Any]:
     """Execute search and return THE recommendation"""
     
     profile = get_simulated_profile(session)
     
-    listings = search_airbnb(
-        destination=context.slots["destination"],
-        check_in=context.slots["check_in"],
-        check_out=context.slots["check_out"],
-        guests=context.slots["guests"]
-    )
+    listings = _search_cached(context, session)
     
     if not listings:
         return {
-            "text": f"Hmm, I couldn't find available places in {context.slots['destination']} for those dates. Try different dates?",
+            "text": f"Hmm, I couldn't find available places in {context.slots.destination} for those dates. Try different dates?",
             "itinerary": None,
             "state": "FAILED",
             "needed": [],
@@ -179,78 +360,49 @@ def execute_search(context: ConversationContext, session: Any) -> Dict[str, Any]
         }
     
     # Rank and get THE best one
-    if context.slots.get("destination") and "cancun" in context.slots["destination"].lower():
-        if hasattr(session, "slots"):
-            session.slots.origin = "Berkeley, California"
+    if context.slots.destination and "cancun" in context.slots.destination.lower():
+        session.slots.origin = "Berkeley, California"
 
-    origin = getattr(session.slots, 'origin', 'SFO') if hasattr(session, 'slots') else "SFO"
+    # slots.origin is None until the client sends a home airport
+    origin = session.slots.origin or "SFO"
     
     # Build intent for ranker
     intent = {
-        "destination": context.slots["destination"],
-        "check_in": context.slots["check_in"],
-        "check_out": context.slots["check_out"],
-        "guests": context.slots["guests"],
-        "budget_max": context.slots.get("budget_max")
+        "destination": context.slots.destination,
+        "check_in": context.slots.check_in,
+        "check_out": context.slots.check_out,
+        "guests": context.slots.guests,
+        "budget_max": context.slots.budget_max
     }
     
-    ranked = rank_listings(listings, intent, origin)
+    # THE pick plus up to three backups is all the reply shows
+    ranked = rank_listings(listings, intent, origin, limit=4)
     best = ranked[0]
     
     # Store for refinement
-    context.shown_properties.append(best["id"])
+    context.shown_properties.add(best["id"])
     context.state = ConversationState.SHOWING_RESULT
     
     # Calculate pricing
-    from datetime import datetime
-    check_in_date = datetime.fromisoformat(context.slots["check_in"])
-    check_out_date = datetime.fromisoformat(context.slots["check_out"])
-    nights = (check_out_date - check_in_date).days
-    total_price = best["price_per_night"] * nights
-    date_label = f"{check_in_date.strftime('%b %d')} – {check_out_date.strftime('%b %d')}"
-    activity_context = {
-        "beach": "for a breezy beach escape",
-        "ski": "for your ski weekend",
-        "wine": "for easy vineyard hopping",
-        "hiking": "near the trailheads",
-        "city": "in the heart of the action",
-        "relaxing": "where you can truly unwind",
-    }.get(context.slots.get("activity"))
+    nights = context.nights
+    total_price = round(best["price_per_night"] * nights)
+    date_label = context.date_label
+    activity = context.slots.activity
+    activity_context = _ACTIVITY_CONTEXT.get(activity)
     
     # Build itinerary
-    itinerary = {
-        "id": best["id"],
-        "destination": context.slots["destination"],
-        "name": best["name"],
-        "dates": {
-            "check_in": context.slots["check_in"],
-            "check_out": context.slots["check_out"]
-        },
-        "stay": {
-            "name": best["name"],
-            "beds": best["beds"],
-            "baths": best["baths"],
-            "price_per_night": best["price_per_night"],
-            "price_total": total_price,
-            "rating": best["rating"],
-            "review_count": best["review_count"],
-            "image_url": best["image_url"],
-            "url": best["url"],
-            "amenities": best["amenities"],
-            "cancellation_policy": best["cancellation_policy"],
-            "guests_max": best["guests_max"],
-            "vibe": best.get("vibe", []),
-            "description": best.get("description", "")
-        },
-        "total_price": total_price,
-        "currency": "USD",
-        "nights": nights,
-        "why_this_property": generate_recommendation_reason(best, context)
-    }
+    itinerary = _build_itinerary(
+        best,
+        context.slots.destination,
+        {"check_in": context.slots.check_in, "check_out": context.slots.check_out},
+        nights,
+        total_price,
+        generate_recommendation_reason(best, context),
+    )
 
     transport_origin = "Berkeley, CA"
-    transport_options = get_transportation_options(transport_origin, context.slots["destination"])
-    recommended_transport = _select_transport_option(context.slots.get("activity"), transport_options)
+    transport_options = get_transportation_options(transport_origin, context.slots.destination)
+    recommended_transport = _select_transport_option(activity, transport_options)
     if recommended_transport:
         itinerary["transportation"] = {
             "origin": transport_origin,
@@ -261,22 +413,13 @@ def execute_search(context: ConversationContext, session: Any) -> Dict[str, Any]
     
     # Build response
     why_text = itinerary["why_this_property"]
-    headline = f"{context.slots['destination']} · {date_label}"
-    lead_in = "Here’s what I’d book"
-    if activity_context:
-        lead_in += f" {activity_context}"
-    lead_in += ":"
-    
-    upbeat_intro = "That sounds like a blast!"
-    if context.slots.get("activity") == "relaxing":
-        upbeat_intro = "This is going to feel so restorative!"
-    elif context.slots.get("activity") == "ski":
-        upbeat_intro = "Fresh powder and good vibes coming right up!"
-    elif context.slots.get("activity") == "wine":
-        upbeat_intro = "Tasting rooms and sunshine? Say no more!"
+    headline = f"{context.slots.destination} · {date_label}"
+    lead_in = f"Here’s what I’d book {activity_context}:" if activity_context else "Here’s what I’d book:"
+    
+    upbeat_intro = _UPBEAT_INTRO.get(activity, "That sounds like a blast!")
     
     persona_line = (
-        f"Since you usually budget around ${profile['avg_budget']:.0f} "
+        f"Since you usually budget around ${profile['avg_budget']} "
         f"and head out with {profile['travel_party']}, we leaned into {profile['trip_style']}."
     )
     
@@ -296,91 +439,63 @@ def execute_search(context: ConversationContext, session: Any) -> Dict[str, Any]
         if len(alternative_options) >= 3:
             break
 
-    fallback_lines = [
-        upbeat_intro,
-        headline,
-        "",
-        lead_in,
-        "",
-        f"**{best['name']}**",
-        "",
-        persona_line,
-    ]
-    if why_text:
-        fallback_lines.extend([why_text, ""])
-    fallback_lines.extend(
-        [
-            f"Total: ${total_price:.0f} ({nights} nights × ${best['price_per_night']:.0f})",
-            f"Layout: {best['beds']} beds · {best['baths']} baths",
-            f"Review score: {best['rating']}/5 ({best['review_count']} reviews)",
-            f"Signature fit: {profile['signature_move']}",
-        ]
-    )
-
+    why_block = f"{why_text}\n\n" if why_text else ""
     vibe_tags = best.get("vibe")
-    if vibe_tags:
-        fallback_lines.append(f"Vibe: {', '.join(vibe_tags)}")
-
-    if recommended_transport:
-        fallback_lines.extend(
-            [
-                "",
-                "Getting there:",
-                f"- {recommended_transport['label']} · {recommended_transport['duration']} · {recommended_transport['cost']}",
-                f"  {recommended_transport['highlights']}",
-            ]
-        )
-
-    if alternative_options:
-        fallback_lines.append("")
-        fallback_lines.append("Other contenders if you want a backup:")
-        for alt in alternative_options:
-            vibe_fragment = f" · {alt['vibe'][0]}" if alt.get("vibe") else ""
-            price_label = alt['price_per_night']
-            price_text = f"${price_label:.0f}/night" if price_label else "ask for rates"
-            fallback_lines.append(f"- {alt['name']} ({price_text}{vibe_fragment})")
-
-    fallback_lines.extend(
-        [
-            "",
-            "Ready when you are—tap the Book button below or tell me what to tweak.",
-        ]
+    vibe_block = f"\nVibe: {', '.join(vibe_tags)}" if vibe_tags else ""
+
+    fallback_text = (
+        f"{upbeat_intro}\n{headline}\n\n{lead_in}\n\n**{best['name']}**\n\n"
+        f"{persona_line}\n{why_block}"
+        f"Total: ${total_price} ({nights} nights × ${best['price_per_night']:.0f})\n"
+        f"Layout: {best['beds']} beds · {best['baths']} baths\n"
+        f"Review score: {best['rating']}/5 ({best['review_count']} reviews)\n"
+        f"Signature fit: {profile['signature_move']}"
+        f"{vibe_block}"
+        f"{_transport_block(recommended_transport)}"
+        f"{_alternatives_block('Other contenders if you want a backup:', alternative_options)}"
+        "\n\nReady when you are—tap the Book button below or tell me what to tweak."
     )
-    fallback_text = "\n".join(fallback_lines)
-
-    llm_payload = {
-        "user_request": getattr(session, "last_user_message", ""),
-        "headline": headline,
-        "lead_in": lead_in,
-        "upbeat_intro": upbeat_intro,
-        "persona_line": persona_line,
-        "profile": profile,
-        "itinerary": {
-            "name": best["name"],
-            "destination": context.slots["destination"],
-            "dates": itinerary["dates"],
-            "nights": nights,
-            "price_per_night": best["price_per_night"],
-            "total_price": total_price,
-            "beds": best["beds"],
-            "baths": best["baths"],
-            "rating": best["rating"],
-            "review_count": best["review_count"],
-            "amenities": best["amenities"][:6],
-            "url": best["url"],
-        },
-        "why_this_property": why_text,
-        "fallback_copy": fallback_text,
-        "catalog_options": alternative_options,
-    }
 
-    if recommended_transport:
-        llm_payload["transportation"] = {
-            "origin": transport_origin,
-            "options": [recommended_transport],
+    # Skip assembling the prompt entirely when Gemini is not configured
+    text = fallback_text
+    if _llm_ready():
+        llm_payload = {
+            "user_request": getattr(session, "last_user_message", ""),
+            "headline": headline,
+            "lead_in": lead_in,
+            "upbeat_intro": upbeat_intro,
+            "persona_line": persona_line,
+            "profile": profile,
+            "itinerary": {
+                "name": best["name"],
+                "destination": context.slots.destination,
+                "dates": itinerary["dates"],
+                "nights": nights,
+                "price_per_night": best["price_per_night"],
+                "total_price": total_price,
+                "beds": best["beds"],
+                "baths": best["baths"],
+                "rating": best["rating"],
+                "review_count": best["review_count"],
+                "amenities": best["amenities"][:6],
+                "url": best["url"],
+            },
+            "why_this_property": why_text,
+            "fallback_copy": fallback_text,
+            "catalog_options": alternative_options,
         }
 
-    text = generate_brand_response(llm_payload)
+        if recommended_transport:
+            llm_payload["transportation"] = {
+                "origin": transport_origin,
+                "options": [recommended_transport],
+            }
+
+        llm = _get_llm()
+        try:
+            text = llm.generate_brand_response(llm_payload)
+        except llm.LLMNotConfiguredError as exc:
+            print(f"LLM copy unavailable, using fallback: {exc}")
 
     return {
         "text": text,
@@ -390,37 +505,95 @@ def execute_search(context: ConversationContext, session: Any) -> Dict[str, Any]
         "quick_replies": []
     }
 
+def _build_itinerary(
+    best: Dict[str, Any],
+    destination: str,
+    dates: Dict[str, str],
+    nights: int,
+    total_price: int,
+    why: str,
+) -> Dict[str, Any]:
+    """Shape a listing into the itinerary payload the client renders"""
+    return {
+        "id": best["id"],
+        "destination": destination,
+        "name": best["name"],
+        "dates": dates,
+        "stay": {
+            "name": best["name"],
+            "beds": best["beds"],
+            "baths": best["baths"],
+            "price_per_night": best["price_per_night"],
+            "price_total": total_price,
+            "rating": best["rating"],
+            "review_count": best["review_count"],
+            "image_url": best["image_url"],
+            "url": best["url"],
+            "amenities": best["amenities"],
+            "cancellation_policy": best["cancellation_policy"],
+            "guests_max": best["guests_max"],
+            "vibe": best.get("vibe", []),
+            "description": best.get("description", "")
+        },
+        "total_price": total_price,
+        "currency": "USD",
+        "nights": nights,
+        "why_this_property": why,
+    }
+
+_COZY_FOR_TWO = "Perfect cozy setup for two"
+_DEFAULT_REASON = "Hand-picked because it's the strongest match available right now"
+
 def generate_recommendation_reason(property_data: Dict, context: ConversationContext) -> str:
     """Generate personalized 'why this property' explanation"""
+    slots = context.slots
+    guests = slots.guests
+    budget_max = slots.budget_max
     reasons = []
+    append = reasons.append
     
     # Location-based
     if property_data.get("coords"):
-        reasons.append(f"Prime location in {context.slots['destination']}")
+        append(f"Prime location in {slots.destination}")
     
     # Capacity
-    if property_data["guests_max"] >= context.slots["guests"]:
-        if context.slots["guests"] > 2:
-            reasons.append(f"Plenty of space for your crew of {context.slots['guests']}")
-        else:
-            reasons.append("Perfect cozy setup for two")
+    if property_data["guests_max"] >= guests:
+        append(f"Plenty of space for your crew of {guests}" if guests > 2 else _COZY_FOR_TWO)
     
     # Rating
-    if property_data["rating"] >= 4.7:
-        reasons.append(f"Loved by guests ({property_data['rating']}/5)")
+    rating = property_data["rating"]
+    if rating >= 4.7:
+        append(f"Loved by guests ({rating}/5)")
     
-    # Budget
-    if context.slots.get("budget_max"):
+    # Budget - only when a budget was given and fewer than three reasons are in
+    if len(reasons) < 3 and budget_max:
         nights = 2  # Default weekend
         total = property_data["price_per_night"] * nights
-        if total <= context.slots["budget_max"]:
-            under = context.slots["budget_max"] - total
-            reasons.append(f"Under budget (saves you ${under:.0f})")
+        if total <= budget_max:
+            append(f"Under budget (saves you ${round(budget_max - total)})")
     
     if not reasons:
-        reasons.append("Hand-picked because it's the strongest match available right now")
+        return _DEFAULT_REASON
     
-    return " • ".join(reasons[:3])  # Top 3 reasons
+    return " • ".join(reasons)  # At most 3 reasons collected above
+
+def _refinement_view(session: Any, listings: list[Dict[str, Any]], refinement_type: str) -> list[Dict[str, Any]]:
+    """
+    Return listings in the order a refinement should walk them. Each ordering is
+    sorted once per result set and reused while the user keeps refining.
+    """
+    sort_spec = _REFINE_SORT_KEYS.get(refinement_type)
+    if sort_spec is None:
+        return listings
+
+    views = getattr(session, "refinement_views", None)
+    if views is None or views[0] is not listings:
+        views = session.refinement_views = (listings, {})
+    ordered = views[1].get(refinement_type)
+    if ordered is None:
+        key, reverse = sort_spec
+        ordered = views[1][refinement_type] = sorted(listings, key=key, reverse=reverse)
+    return ordered
 
 def handle_refinement(session: Any, refinement_type: str) -> Dict[str, Any]:
     """Handle user refinement requests"""
@@ -429,16 +602,14 @@ def handle_refinement(session: Any, refinement_type: str) -> Dict[str, Any]:
     previous = session.last_itinerary
     profile = get_simulated_profile(session)
     
-    # Get all listings again
-    listings = search_airbnb(
-        destination=context.slots["destination"],
-        check_in=context.slots["check_in"],
-        check_out=context.slots["check_out"],
-        guests=context.slots["guests"]
-    )
+    # Reuse the listings from the search that produced the previous pick
+    listings = _search_cached(context, session)
     
-    # Filter out shown properties
-    available = [l for l in listings if l["id"] not in context.shown_properties]
+    # Filter out shown properties, keeping the order this refinement prefers
+    available = [
+        l for l in _refinement_view(session, listings, refinement_type)
+        if l["id"] not in context.shown_properties
+    ]
     
     if not available:
         return {
@@ -450,57 +621,30 @@ def handle_refinement(session: Any, refinement_type: str) -> Dict[str, Any]:
         }
     
     # Apply refinement
-    if refinement_type == "cheaper":
-        available.sort(key=lambda x: x["price_per_night"])
-        best = available[0]
-        tradeoff = f"${previous['total_price'] - (best['price_per_night'] * previous['nights']):.0f} cheaper"
-    
-    elif refinement_type == "bigger":
-        available.sort(key=lambda x: x["beds"], reverse=True)
-        best = available[0]
-        tradeoff = f"{best['beds']} beds (vs {previous['stay']['beds']})"
-    
-    else:  # different
-        best = available[0]
-        tradeoff = "Different area"
+    best = available[0]
+    nights = previous["nights"]
+    total_price = round(best["price_per_night"] * nights)
+    describe_tradeoff = _REFINE_TRADEOFFS.get(refinement_type)
+    tradeoff = (
+        describe_tradeoff(best, previous, total_price) if describe_tradeoff else "Different area"
+    )
     
     # Mark as shown
-    context.shown_properties.append(best["id"])
+    context.shown_properties.add(best["id"])
     
     # Build new itinerary
-    nights = previous["nights"]
-    total_price = best["price_per_night"] * nights
-    
-    itinerary = {
-        "id": best["id"],
-        "destination": context.slots["destination"],
-        "name": best["name"],
-        "dates": previous["dates"],
-        "stay": {
-            "name": best["name"],
-            "beds": best["beds"],
-            "baths": best["baths"],
-            "price_per_night": best["price_per_night"],
-            "price_total": total_price,
-            "rating": best["rating"],
-            "review_count": best["review_count"],
-            "image_url": best["image_url"],
-            "url": best["url"],
-            "amenities": best["amenities"],
-            "cancellation_policy": best["cancellation_policy"],
-            "guests_max": best["guests_max"],
-            "vibe": best.get("vibe", []),
-            "description": best.get("description", "")
-        },
-        "total_price": total_price,
-        "currency": "USD",
-        "nights": nights,
-        "why_this_property": f"Alternative option: {tradeoff}"
-    }
+    itinerary = _build_itinerary(
+        best,
+        context.slots.destination,
+        previous["dates"],
+        nights,
+        total_price,
+        f"Alternative option: {tradeoff}",
+    )
 
     transport_origin = "Berkeley, CA"
-    transport_options = get_transportation_options(transport_origin, context.slots["destination"])
-    recommended_transport = _select_transport_option(context.slots.get("activity"), transport_options)
+    transport_options = get_transportation_options(transport_origin, context.slots.destination)
+    recommended_transport = _select_transport_option(context.slots.activity, transport_options)
     if recommended_transport:
         itinerary["transportation"] = {
             "origin": transport_origin,
@@ -525,75 +669,59 @@ def handle_refinement(session: Any, refinement_type: str) -> Dict[str, Any]:
         if len(alternative_options) >= 3:
             break
 
-    fallback_lines = [
-        "Totally hear you—let's try this vibe instead!",
-        "",
-        f"**{best['name']}**",
-        "",
-        f"Trade-off: {tradeoff}",
-        f"Keeps things comfy for {profile['travel_party']} without straying from your usual ${profile['avg_budget']:.0f} game plan.",
-        "",
-        f"Total: ${total_price:.0f}",
-        f"Layout: {best['beds']} beds · {best['baths']} baths",
-        f"Review score: {best['rating']}/5 ({best['review_count']} reviews)",
-    ]
-
     vibe_tags = best.get("vibe")
-    if vibe_tags:
-        fallback_lines.append(f"Vibe: {', '.join(vibe_tags)}")
-
-    if recommended_transport:
-        fallback_lines.extend(
-            [
-                "",
-                "Getting there:",
-                f"- {recommended_transport['label']} · {recommended_transport['duration']} · {recommended_transport['cost']}",
-                f"  {recommended_transport['highlights']}",
-            ]
-        )
-
-    if alternative_options:
-        fallback_lines.append("")
-        fallback_lines.append("Other contenders worth a peek:")
-        for alt in alternative_options[:3]:
-            vibe_fragment = f" · {alt['vibe'][0]}" if alt.get("vibe") else ""
-            price_label = alt['price_per_night']
-            price_text = f"${price_label:.0f}/night" if price_label else "ask for rates"
-            fallback_lines.append(f"- {alt['name']} ({price_text}{vibe_fragment})")
-
-    fallback_lines.extend(["", "Tap Book below if this is the one."])
-    fallback_text = "\n".join(fallback_lines)
-
-    llm_payload = {
-        "user_request": getattr(session, "last_user_message", ""),
-        "refinement_type": refinement_type,
-        "profile": profile,
-        "tradeoff": tradeoff,
-        "itinerary": {
-            "name": best["name"],
-            "destination": context.slots["destination"],
-            "dates": itinerary["dates"],
-            "nights": nights,
-            "price_per_night": best["price_per_night"],
-            "total_price": total_price,
-            "beds": best["beds"],
-            "baths": best["baths"],
-            "rating": best["rating"],
-            "review_count": best["review_count"],
-            "amenities": best["amenities"][:6],
-            "url": best["url"],
-        },
-        "fallback_copy": fallback_text,
-        "catalog_options": alternative_options,
-    }
+    vibe_block = f"\nVibe: {', '.join(vibe_tags)}" if vibe_tags else ""
+
+    fallback_text = (
+        f"Totally hear you—let's try this vibe instead!\n\n**{best['name']}**\n\n"
+        f"Trade-off: {tradeoff}\n"
+        f"Keeps things comfy for {profile['travel_party']} without straying from your usual ${profile['avg_budget']} game plan.\n\n"
+        f"Total: ${total_price}\n"
+        f"Layout: {best['beds']} beds · {best['baths']} baths\n"
+        f"Review score: {best['rating']}/5 ({best['review_count']} reviews)"
+        f"{vibe_block}"
+        f"{_transport_block(recommended_transport)}"
+        f"{_alternatives_block('Other contenders worth a peek:', alternative_options)}"
+        "\n\nTap Book below if this is the one."
+    )
 
-    if recommended_transport:
-        llm_payload["transportation"] = {
-            "origin": transport_origin,
-            "options": [recommended_transport],
+    # Skip assembling the prompt entirely when Gemini is not configured
+    text = fallback_text
+    if _llm_ready():
+        llm_payload = {
+            "user_request": getattr(session, "last_user_message", ""),
+            "refinement_type": refinement_type,
+            "profile": profile,
+            "tradeoff": tradeoff,
+            "itinerary": {
+                "name": best["name"],
+                "destination": context.slots.destination,
+                "dates": itinerary["dates"],
+                "nights": nights,
+                "price_per_night": best["price_per_night"],
+                "total_price": total_price,
+                "beds": best["beds"],
+                "baths": best["baths"],
+                "rating": best["rating"],
+                "review_count": best["review_count"],
+                "amenities": best["amenities"][:6],
+                "url": best["url"],
+            },
+            "fallback_copy": fallback_text,
+            "catalog_options": alternative_options,
         }
 
-    text = generate_brand_response(llm_payload)
+        if recommended_transport:
+            llm_payload["transportation"] = {
+                "origin": transport_origin,
+                "options": [recommended_transport],
+            }
+
+        llm = _get_llm()
+        try:
+            text = llm.generate_brand_response(llm_payload)
+        except llm.LLMNotConfiguredError as exc:
+            print(f"LLM copy unavailable, using fallback: {exc}")
     
     return {
         "text": text,
@@ -602,7 +730,31 @@ def handle_refinement(session: Any, refinement_type: str) -> Dict[str, Any]:
         "needed": [],
         "quick_replies": []
     }
-def _select_transport_option(activity: str | None, options: list[dict[str, str]]) -> dict[str, str] | None:
+def _transport_block(option: Dict[str, Any] | None) -> str:
+    """Fallback-copy lines for the recommended ride, or "" without one."""
+    if not option:
+        return ""
+    return (
+        f"\n\nGetting there:\n"
+        f"- {option['label']} · {option['duration']} · {option['cost']}\n"
+        f"  {option['highlights']}"
+    )
+
+
+def _alternatives_block(header: str, alternatives: list[dict[str, Any]]) -> str:
+    """Fallback-copy lines listing backup stays, or "" when there are none."""
+    if not alternatives:
+        return ""
+    lines = []
+    for alt in alternatives:
+        vibe_fragment = f" · {alt['vibe'][0]}" if alt.get("vibe") else ""
+        price_label = alt["price_per_night"]
+        price_text = f"${price_label:.0f}/night" if price_label else "ask for rates"
+        lines.append(f"- {alt['name']} ({price_text}{vibe_fragment})")
+    return f"\n\n{header}\n" + "\n".join(lines)
+
+
+def _select_transport_option(activity: str | None, options: tuple[dict[str, str], ...]) -> dict[str, str] | None:
     if not options:
         return None
 
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import copy
 import json
 import random
+import re
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 DATA_DIR = Path(__file__).resolve().parent.parent
 
-_CATALOG_CACHE: Dict[str, List[Dict[str, Any]]] = {}
+# Catalog rows are finalised at load time and shared read-only between searches
+_CATALOG_CACHE: Dict[str, Tuple[Dict[str, Any], ...]] = {}
 _CATALOG_LOADED = False
+# Substring-resolved destination -> catalog listings, filled on first lookup
+_FUZZY_MATCHES: Dict[str, Tuple[Dict[str, Any], ...]] = {}
 
 _DESTINATION_COORDS: Dict[str, tuple[float, float]] = {
     "lake tahoe": (39.0968, -120.0324),
@@ -20,6 +24,71 @@ _DESTINATION_COORDS: Dict[str, tuple[float, float]] = {
 }
 _DEFAULT_COORDS = (37.7749, -122.4194)
 
+_MOCK_AMENITIES = ("Wifi", "Kitchen", "Free parking", "Pool", "Hot tub", "AC", "Washer", "Workspace")
+_CANCELLATION_POLICIES = ("Flexible", "Moderate", "Strict")
+
+# Mock listings: destination anchors and the stays generated around them
+_MOCK_COORDS: Dict[str, tuple[float, float]] = {
+    "tahoe": (39.0968, -120.0324),
+    "lake tahoe": (39.0968, -120.0324),
+    "south lake tahoe": (38.9399, -119.9772),
+    "san diego": (32.7157, -117.1611),
+    "napa": (38.2975, -122.2869),
+    "big sur": (36.2704, -121.8081),
+    "joshua tree": (34.1347, -116.3128),
+    "palm springs": (33.8303, -116.5453),
+    "santa barbara": (34.4208, -119.6982),
+    "monterey": (36.6002, -121.8947),
+    "san francisco": (37.7749, -122.4194),
+    "los angeles": (34.0522, -118.2437),
+    "cancun": (21.1619, -86.8515),
+}
+
+
+class _MockTemplate(NamedTuple):
+    name: str
+    beds: int
+    baths: float
+    base_price: int
+    image_url: str
+
+
+def _mock_template(name: str, beds: int, baths: float, base_price: int) -> _MockTemplate:
+    image_url = f"https://via.placeholder.com/400x300/667eea/ffffff?text={name.split()[0]}"
+    return _MockTemplate(name, beds, baths, base_price, image_url)
+
+
+_MOCK_TEMPLATES = (
+    _mock_template("Modern Cabin with Mountain Views", 2, 1.5, 180),
+    _mock_template("Luxury Condo Downtown", 3, 2, 250),
+    _mock_template("Cozy Studio Near Beach", 1, 1, 120),
+    _mock_template("Spacious Home with Hot Tub", 4, 2.5, 320),
+    _mock_template("Charming Cottage with Fireplace", 2, 1, 150),
+    _mock_template("Beachfront Apartment", 2, 2, 280),
+    _mock_template("Rustic Retreat with Deck", 3, 1.5, 200),
+    _mock_template("Chic Loft in Arts District", 1, 1, 140),
+    _mock_template("Family House Near Attractions", 4, 3, 350),
+    _mock_template("Vintage Bungalow with Garden", 2, 1, 165),
+)
+
+# Amenity cues -> vibe tag, in the order tags are reported
+_AMENITY_VIBE_CUES = {
+    "spa & wellness": ("spa", "wellness"),
+    "poolside scene": ("pool", "infinity"),
+    "beach access": ("beach", "ocean", "shore"),
+    "fireside evenings": ("fireplace",),
+    "slope-ready": ("ski", "heavenly", "northstar"),
+}
+_AMENITY_VIBES = tuple(_AMENITY_VIBE_CUES)
+_AMENITY_VIBE_BY_CUE = {
+    cue: vibe for vibe, cues in _AMENITY_VIBE_CUES.items() for cue in cues
+}
+# One pass over the amenities text finds every cue
+_AMENITY_CUE_RE = re.compile("|".join(_AMENITY_VIBE_BY_CUE))
+
+# Everything _extract_numeric strips before parsing: all but ASCII digits and "."
+_NON_NUMERIC_RE = re.compile(r"[^0-9.]+")
+
 
 def search_airbnb(destination: str, check_in: str, check_out: str, guests: int = 2) -> List[Dict[str, Any]]:
     """Return curated listings when the catalog contains them, else fallback to mocks."""
@@ -27,8 +96,7 @@ def search_airbnb(destination: str, check_in: str, check_out: str, guests: int =
 
     catalog_listings = _match_catalog(destination)
     if catalog_listings:
-        listings_copy = copy.deepcopy(catalog_listings)
-        return _filter_guest_capacity(listings_copy, guests)
+        return _filter_guest_capacity(catalog_listings, guests)
 
     return _generate_mock_listings(destination, check_in, check_out, guests)
 
@@ -47,17 +115,18 @@ def _load_catalog_file(filename: str) -> None:
         return
 
     try:
-        raw = json.loads(data_path.read_text(encoding="utf-8"))
+        # json.loads decodes UTF-8 bytes itself; skip the separate str round-trip
+        raw = json.loads(data_path.read_bytes())
     except json.JSONDecodeError:
         return
 
     destinations = raw.get("travel_database", {}).get("destinations", [])
     for dest_entry in destinations:
-        listings = _convert_destination_entry(dest_entry)
+        listings = tuple(_convert_destination_entry(dest_entry))
         if not listings:
             continue
         for key in _destination_keys(dest_entry):
-            _CATALOG_CACHE[key] = listings
+            _CATALOG_CACHE[sys.intern(key)] = listings
 
 
 def _destination_keys(dest_entry: Dict[str, Any]) -> List[str]:
@@ -81,16 +150,24 @@ def _normalize_key(value: str) -> str:
     return value.strip().lower()
 
 
-def _match_catalog(destination: str) -> List[Dict[str, Any]]:
+def _match_catalog(destination: str) -> Tuple[Dict[str, Any], ...]:
     dest_lower = destination.lower()
     if dest_lower in _CATALOG_CACHE:
         return _CATALOG_CACHE[dest_lower]
 
+    # Destinations come from a small canonical set, so each fuzzy resolution
+    # (including a miss) is scanned for once and remembered
+    if dest_lower in _FUZZY_MATCHES:
+        return _FUZZY_MATCHES[dest_lower]
+
+    match: Tuple[Dict[str, Any], ...] = ()
     for key, listings in _CATALOG_CACHE.items():
         if key in dest_lower or dest_lower in key:
-            return listings
+            match = listings
+            break
 
-    return []
+    _FUZZY_MATCHES[dest_lower] = match
+    return match
 
 
 def _convert_destination_entry(dest_entry: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -181,10 +258,13 @@ def _normalize_catalog_property(
     if not description:
         description = _compose_description(prop, amenities, tags)
 
-    image_url = prop.get(
-        "image_url",
-        f"https://source.unsplash.com/featured/?{_normalize_key(dest_entry.get('name', '').split(',')[0])},travel,{random.randint(100, 999)}",
-    )
+    image_url = prop.get("image_url")
+    if image_url is None:
+        # Only draw a placeholder seed for properties without their own photo
+        image_url = (
+            f"https://source.unsplash.com/featured/?"
+            f"{_normalize_key(dest_entry.get('name', '').split(',')[0])},travel,{random.randint(100, 999)}"
+        )
 
     return {
         "id": f"CATALOG_{listing_id}",
@@ -200,7 +280,7 @@ def _normalize_catalog_property(
         "review_count": review_count,
         "image_url": image_url,
         "url": prop.get("url"),
-        "amenities": amenities[:12] if isinstance(amenities, list) else amenities,
+        "amenities": tuple(amenities[:12]) if isinstance(amenities, list) else amenities,
         "cancellation_policy": prop.get("cancellation_policy", "Flexible"),
         "description": description,
         "vibe": vibe,
@@ -217,7 +297,7 @@ def _extract_numeric(value: Any, fallback: int | float | None = None) -> Optiona
     if isinstance(value, (int, float)):
         return value
     if isinstance(value, str):
-        digits = "".join(ch for ch in value if ch.isdigit() or ch == ".")
+        digits = _NON_NUMERIC_RE.sub("", value)
         if digits:
             try:
                 number = float(digits)
@@ -247,16 +327,9 @@ def _derive_vibe_tags(
         if tags.get("eco_certified"):
             result.append("eco-certified stay")
 
-    if "spa" in amenities_text or "wellness" in amenities_text:
-        result.append("spa & wellness")
-    if "pool" in amenities_text or "infinity" in amenities_text:
-        result.append("poolside scene")
-    if "beach" in amenities_text or "ocean" in amenities_text or "shore" in amenities_text:
-        result.append("beach access")
-    if "fireplace" in amenities_text:
-        result.append("fireside evenings")
-    if "ski" in amenities_text or "heavenly" in amenities_text or "northstar" in amenities_text:
-        result.append("slope-ready")
+    found = {_AMENITY_VIBE_BY_CUE[cue] for cue in _AMENITY_CUE_RE.findall(amenities_text)}
+    if found:
+        result.extend(vibe for vibe in _AMENITY_VIBES if vibe in found)
     if "resort" in property_type_lower:
         result.append("resort living")
 
@@ -285,82 +358,49 @@ def _compose_description(prop: Dict[str, Any], amenities: List[str], tags: Dict[
 
 
 def _resolve_coords(destination_name: str) -> tuple[float, float]:
-    key = _normalize_key(destination_name.split(",")[0]) if destination_name else ""
-    if key in _DESTINATION_COORDS:
-        return _DESTINATION_COORDS[key]
-
-    return _DESTINATION_COORDS.get(_normalize_key(destination_name), _DEFAULT_COORDS)
+    # Normalise once; the primary place name is the part before the first comma
+    full_key = _normalize_key(destination_name)
+    primary_key = full_key.split(",", 1)[0].rstrip()
+    return _DESTINATION_COORDS.get(primary_key) or _DESTINATION_COORDS.get(full_key, _DEFAULT_COORDS)
 
 
-def _filter_guest_capacity(listings: List[Dict[str, Any]], guests: int) -> List[Dict[str, Any]]:
-    filtered: List[Dict[str, Any]] = []
-    for listing in listings:
-        capacity = _extract_numeric(listing.get("guests_max"), fallback=None)
-        if capacity is None or capacity >= guests:
-            if capacity is None:
-                listing["guests_max"] = guests
-            filtered.append(listing)
-    return filtered or listings
+def _filter_guest_capacity(listings: Tuple[Dict[str, Any], ...], guests: int) -> List[Dict[str, Any]]:
+    """Drop listings too small for the party; guests_max is numeric since load time."""
+    filtered = [listing for listing in listings if listing["guests_max"] >= guests]
+    return filtered or list(listings)
 
 
 def _generate_mock_listings(destination: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
-    coords_map = {
-        "tahoe": (39.0968, -120.0324),
-        "lake tahoe": (39.0968, -120.0324),
-        "south lake tahoe": (38.9399, -119.9772),
-        "san diego": (32.7157, -117.1611),
-        "napa": (38.2975, -122.2869),
-        "big sur": (36.2704, -121.8081),
-        "joshua tree": (34.1347, -116.3128),
-        "palm springs": (33.8303, -116.5453),
-        "santa barbara": (34.4208, -119.6982),
-        "monterey": (36.6002, -121.8947),
-        "san francisco": (37.7749, -122.4194),
-        "los angeles": (34.0522, -118.2437),
-        "cancun": (21.1619, -86.8515),
-    }
+    coords = _MOCK_COORDS.get(destination.lower(), _DEFAULT_COORDS)
 
-    dest_lower = destination.lower()
-    coords = coords_map.get(dest_lower, _DEFAULT_COORDS)
-
-    templates = [
-        {"name": "Modern Cabin with Mountain Views", "beds": 2, "baths": 1.5, "base_price": 180},
-        {"name": "Luxury Condo Downtown", "beds": 3, "baths": 2, "base_price": 250},
-        {"name": "Cozy Studio Near Beach", "beds": 1, "baths": 1, "base_price": 120},
-        {"name": "Spacious Home with Hot Tub", "beds": 4, "baths": 2.5, "base_price": 320},
-        {"name": "Charming Cottage with Fireplace", "beds": 2, "baths": 1, "base_price": 150},
-        {"name": "Beachfront Apartment", "beds": 2, "baths": 2, "base_price": 280},
-        {"name": "Rustic Retreat with Deck", "beds": 3, "baths": 1.5, "base_price": 200},
-        {"name": "Chic Loft in Arts District", "beds": 1, "baths": 1, "base_price": 140},
-        {"name": "Family House Near Attractions", "beds": 4, "baths": 3, "base_price": 350},
-        {"name": "Vintage Bungalow with Garden", "beds": 2, "baths": 1, "base_price": 165},
-    ]
+    # Bind the RNG once; draws stay in the same order as before, so seeded
+    # runs reproduce the same listings
+    uniform, randint = random.uniform, random.randint
+    sample, choice = random.sample, random.choice
+    id_prefix = f"MOCK_{destination.replace(' ', '_').upper()}_"
 
     listings: List[Dict[str, Any]] = []
-    for i, template in enumerate(templates):
-        lat_offset = random.uniform(-0.05, 0.05)
-        lng_offset = random.uniform(-0.05, 0.05)
-        price_variance = random.randint(-20, 40)
+    for i, template in enumerate(_MOCK_TEMPLATES):
+        lat_offset = uniform(-0.05, 0.05)
+        lng_offset = uniform(-0.05, 0.05)
+        price_variance = randint(-20, 40)
 
         listings.append(
             {
-                "id": f"MOCK_{destination.replace(' ', '_').upper()}_{i+1}",
-                "name": template["name"],
+                "id": f"{id_prefix}{i+1}",
+                "name": template.name,
                 "destination": destination,
                 "coords": (coords[0] + lat_offset, coords[1] + lng_offset),
-                "beds": template["beds"],
-                "baths": template["baths"],
-                "guests_max": template["beds"] * 2,
-                "price_per_night": template["base_price"] + price_variance,
-                "rating": round(random.uniform(4.2, 4.95), 2),
-                "review_count": random.randint(15, 250),
-                "image_url": f"https://via.placeholder.com/400x300/667eea/ffffff?text={template['name'].split()[0]}",
-                "url": f"https://airbnb.com/rooms/{random.randint(10000000, 99999999)}",
-                "amenities": random.sample(
-                    ["Wifi", "Kitchen", "Free parking", "Pool", "Hot tub", "AC", "Washer", "Workspace"],
-                    k=random.randint(3, 6),
-                ),
-                "cancellation_policy": random.choice(["Flexible", "Moderate", "Strict"]),
+                "beds": template.beds,
+                "baths": template.baths,
+                "guests_max": template.beds * 2,
+                "price_per_night": template.base_price + price_variance,
+                "rating": round(uniform(4.2, 4.95), 2),
+                "review_count": randint(15, 250),
+                "image_url": template.image_url,
+                "url": f"https://airbnb.com/rooms/{randint(10000000, 99999999)}",
+                "amenities": sample(_MOCK_AMENITIES, k=randint(3, 6)),
+                "cancellation_policy": choice(_CANCELLATION_POLICIES),
                 "description": "",
                 "vibe": ["curated escape"],
             }
@@ -1,83 +1,170 @@
 from __future__ import annotations
-from enum import Enum
+import re
+from dataclasses import dataclass
+from enum import IntEnum, auto
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from dateutil import tz
+from zoneinfo import ZoneInfo
 
-PACIFIC = tz.gettz("America/Los_Angeles")
+PACIFIC = ZoneInfo("America/Los_Angeles")
 
-class ConversationState(Enum):
-    INITIAL = "initial"
-    NEED_LOCATION = "need_location"
-    NEED_DATES = "need_dates"
-    NEED_CUSTOM_DATES = "need_custom_dates"
-    NEED_GUESTS = "need_guests"
-    READY_TO_SEARCH = "ready_to_search"
-    SHOWING_RESULT = "showing_result"
-    REFINING = "refining"
+# Whole-word activity cues as regex alternatives. Stems with \w* cover the
+# inflections users type ("snowy", "surfers", "hiked", "relaxation"); phrases
+# stay phrases, so "winter getaway" is not a ski trip. Word boundaries keep
+# "whiskey" from reading as "ski" and "thousand" as "sand". When several
+# activities match, the earlier one here wins.
+_ACTIVITY_CUES = {
+    "beach": (r"beach\w*", r"ocean\w*", r"surf\w*", r"coastal", r"sand(?:y|s)?", r"seaside"),
+    "ski": (r"ski(?:s|ing|er|ers|ed)?", r"snow\w*", r"winter sports"),
+    "wine": (r"wine\w*", r"vineyards?", r"winer(?:y|ies)", r"tastings?", r"wine country"),
+    "hiking": (r"hik\w*", r"trails?", r"nature", r"outdoors", r"mountains?"),
+    "city": (r"city", r"urban", r"downtown", r"nightlife", r"restaurants?"),
+    "relaxing": (r"relax\w*", r"peaceful", r"quiet", r"spas?", r"retreats?"),
+}
+_ACTIVITY_RANK = {activity: rank for rank, activity in enumerate(_ACTIVITY_CUES)}
+# One scan over the message; the named group that matched is the activity
+_ACTIVITY_RE = re.compile(
+    "|".join(
+        rf"(?P<{activity}>\b(?:{'|'.join(cues)})\b)"
+        for activity, cues in _ACTIVITY_CUES.items()
+    )
+)
+
+# Three-letter month prefix -> full month name; typos past the prefix still resolve
+_MONTH_BY_PREFIX = {
+    "jan": "January", "feb": "February", "mar": "March", "apr": "April",
+    "may": "May", "jun": "June", "jul": "July", "aug": "August",
+    "sep": "September", "oct": "October", "nov": "November", "dec": "December",
+}
+
+# "Nov 15-17" / "Januar 1-15" and "1/15-1/17" date ranges
+_MONTH_RANGE_RE = re.compile(r'([a-z]+)\s+(\d+)\s*[-–]\s*(\d+)')
+_NUMERIC_RANGE_RE = re.compile(r'(\d{1,2})/(\d{1,2})\s*[-–]\s*(\d{1,2})/(\d{1,2})')
+_NUMBER_RE = re.compile(r'\d+')
+
+# Days from each weekday (Mon=0) to the Friday check-in. "This weekend" on a
+# Friday already means the following one; "next weekend" is a week past the
+# coming Friday.
+_DAYS_TO_THIS_FRIDAY = tuple((4 - weekday) % 7 or 7 for weekday in range(7))
+_DAYS_TO_NEXT_FRIDAY = tuple((4 - weekday) % 7 + 7 for weekday in range(7))
+
+# Party sizes said in words; "large" is the "Large group (7+)" quick reply
+_GUEST_WORD_COUNTS = {
+    "just me": 1, "solo": 1, "couple": 2, "two": 2, "three": 3,
+    "four": 4, "five": 5, "six": 6, "large": 8,
+}
+_GUEST_WORD_RE = re.compile(r"\b(" + "|".join(_GUEST_WORD_COUNTS) + r")\b")
+_MAX_GUESTS = 20
+
+class ConversationState(IntEnum):
+    INITIAL = auto()
+    NEED_LOCATION = auto()
+    NEED_DATES = auto()
+    NEED_CUSTOM_DATES = auto()
+    NEED_GUESTS = auto()
+    READY_TO_SEARCH = auto()
+    SHOWING_RESULT = auto()
+    REFINING = auto()
+
+@dataclass(slots=True)
+class Slots:
+    """Trip details collected from the conversation so far"""
+    destination: Optional[str] = None
+    activity: Optional[str] = None
+    check_in: Optional[str] = None
+    check_out: Optional[str] = None
+    guests: Optional[int] = None
+    budget_max: Optional[float] = None
+    vibe: Optional[str] = None
 
 class ConversationContext:
     def __init__(self):
         self.state = ConversationState.INITIAL
-        self.slots = {
-            "destination": None,
-            "activity": None,
-            "check_in": None,
-            "check_out": None,
-            "guests": None,
-            "budget_max": None,
-            "vibe": None,
-        }
+        self.slots = Slots()
         self.refinement_preferences = []
-        self.shown_properties = []
+        self.shown_properties: set[str] = set()
         self.waiting_for_custom_dates = False
+        self.check_in_date: Optional[datetime] = None
+        self.check_out_date: Optional[datetime] = None
+        self.nights: Optional[int] = None
+        self.date_label = ""
+    
+    def set_dates(self, check_in: str, check_out: str) -> None:
+        """Store ISO dates and pre-compute what searches derive from them"""
+        self.slots.check_in = check_in
+        self.slots.check_out = check_out
+        self.check_in_date = datetime.fromisoformat(check_in)
+        self.check_out_date = datetime.fromisoformat(check_out)
+        self.nights = (self.check_out_date - self.check_in_date).days
+        self.date_label = f"{self.check_in_date.strftime('%b %d')} – {self.check_out_date.strftime('%b %d')}"
         
     def extract_activity(self, message: str) -> Optional[str]:
         """Extract activity type from message"""
-        msg = message.lower()
-        activities = {
-            "beach": ["beach", "ocean", "surf", "coastal", "sand", "seaside"],
-            "ski": ["ski", "skiing", "snowboard", "snow", "winter sports"],
-            "wine": ["wine", "vineyard", "winery", "tasting", "wine country"],
-            "hiking": ["hike", "hiking", "trail", "nature", "outdoors", "mountains"],
-            "city": ["city", "urban", "downtown", "nightlife", "restaurants"],
-            "relaxing": ["relax", "peaceful", "quiet", "spa", "retreat"],
-        }
-        for activity, keywords in activities.items():
-            if any(kw in msg for kw in keywords):
-                return activity
-        return None
+        best = None
+        for match in _ACTIVITY_RE.finditer(message.lower()):
+            activity = match.lastgroup
+            if best is None or _ACTIVITY_RANK[activity] < _ACTIVITY_RANK[best]:
+                best = activity
+                if _ACTIVITY_RANK[best] == 0:
+                    break
+        return best
     
     def missing_critical_slots(self) -> List[str]:
         """Return required slots that are missing"""
         missing = []
-        if not self.slots["destination"]:
+        if not self.slots.destination:
             missing.append("destination")
-        if not self.slots["check_in"]:
+        if not self.slots.check_in:
             missing.append("dates")
-        if not self.slots["guests"]:
+        if not self.slots.guests:
             missing.append("guests")
         return missing
     
+    def next_needed(self) -> ConversationState:
+        """The state for the first required slot still missing, in asking order"""
+        if not self.slots.destination:
+            return ConversationState.NEED_LOCATION
+        if not self.slots.check_in:
+            return ConversationState.NEED_DATES
+        if not self.slots.guests:
+            return ConversationState.NEED_GUESTS
+        return ConversationState.READY_TO_SEARCH
+    
     def is_ready_to_search(self) -> bool:
         """Can we search with current data?"""
         return bool(
-            self.slots["destination"] and 
-            self.slots["check_in"] and 
-            self.slots["guests"]
+            self.slots.destination and 
+            self.slots.check_in and 
+            self.slots.guests
         )
 
+_ACTIVITY_DESTINATIONS = {
+    "beach": ("San Diego", "Santa Cruz", "Malibu", "Monterey", "Santa Barbara"),
+    "ski": ("Lake Tahoe", "Mammoth Lakes", "Big Bear", "Tahoe City"),
+    "wine": ("Napa", "Sonoma", "Paso Robles", "Healdsburg"),
+    "hiking": ("Yosemite", "Big Sur", "Joshua Tree", "Sequoia"),
+    "city": ("San Francisco", "Los Angeles", "San Diego", "Oakland"),
+    "relaxing": ("Big Sur", "Carmel", "Mendocino", "Ojai"),
+}
+_DEFAULT_DESTINATIONS = ("San Diego", "Lake Tahoe", "Napa", "Big Sur", "San Francisco")
+# Destination quick replies are fixed per activity, so shape them once
+_DESTINATION_QUICK_REPLIES = {
+    activity: (*destinations, "Somewhere else")[:6]
+    for activity, destinations in _ACTIVITY_DESTINATIONS.items()
+}
+_DEFAULT_DESTINATION_QUICK_REPLIES = (*_DEFAULT_DESTINATIONS, "Somewhere else")[:6]
+_BROWSE_DESTINATIONS = (
+    "San Diego", "Lake Tahoe", "Napa", "Big Sur", "San Francisco",
+    "Santa Barbara", "Monterey", "Joshua Tree",
+)
+# Quick replies are shared immutable tuples; responses hand them out as-is
+_STARTER_DESTINATIONS = ("San Diego", "Lake Tahoe", "Napa", "Big Sur", "Somewhere else")
+_DATE_OPTIONS = ("This weekend", "Next weekend", "I have specific dates")
+_GUEST_OPTIONS = ("Just me", "2 people", "3-4 people", "5-6 people", "Large group (7+)")
+
 def get_destinations_for_activity(activity: str) -> List[str]:
     """Return relevant destinations based on activity"""
-    mapping = {
-        "beach": ["San Diego", "Santa Cruz", "Malibu", "Monterey", "Santa Barbara"],
-        "ski": ["Lake Tahoe", "Mammoth Lakes", "Big Bear", "Tahoe City"],
-        "wine": ["Napa", "Sonoma", "Paso Robles", "Healdsburg"],
-        "hiking": ["Yosemite", "Big Sur", "Joshua Tree", "Sequoia"],
-        "city": ["San Francisco", "Los Angeles", "San Diego", "Oakland"],
-        "relaxing": ["Big Sur", "Carmel", "Mendocino", "Ojai"],
-    }
-    return mapping.get(activity, ["San Diego", "Lake Tahoe", "Napa", "Big Sur", "San Francisco"])
+    return list(_ACTIVITY_DESTINATIONS.get(activity, _DEFAULT_DESTINATIONS))
 
 def generate_clarification(context: ConversationContext, message: str) -> Dict[str, Any]:
     """Generate next clarification question based on context"""
@@ -90,146 +177,104 @@ def generate_clarification(context: ConversationContext, message: str) -> Dict[s
         return {
             "action": "clarify",
             "question": "Great! Please type your dates (e.g., 'Nov 15-17' or 'December 1-3'):",
-            "quick_replies": [],
+            "quick_replies": (),
             "collecting": "custom_dates",
             "context": context
         }
     
     # Extract activity if not set
-    if not context.slots["activity"]:
-        context.slots["activity"] = context.extract_activity(message)
-    
-    # Check what we still need
-    missing = context.missing_critical_slots()
+    if not context.slots.activity:
+        context.slots.activity = context.extract_activity(msg_lower)
     
-    if not missing:
-        return {"action": "search", "context": context}
-    
-    # Ask for destination
-    if "destination" in missing:
-        if "somewhere else" in msg_lower or "different" in msg_lower:
-            all_destinations = [
-                "San Diego", "Lake Tahoe", "Napa", "Big Sur", "San Francisco",
-                "Santa Barbara", "Monterey", "Joshua Tree", "Carmel", "Sonoma"
-            ]
+    # Ask for the first required slot still missing
+    match context.next_needed():
+        case ConversationState.NEED_LOCATION:
+            if "somewhere else" in msg_lower or "different" in msg_lower:
+                return {
+                    "action": "clarify",
+                    "question": "Great! Here are some wonderful destinations:",
+                    "quick_replies": _BROWSE_DESTINATIONS,
+                    "collecting": "destination",
+                    "context": context
+                }
+            
+            if context.slots.activity:
+                return {
+                    "action": "clarify",
+                    "question": "Perfect! Where would you like to go?",
+                    "quick_replies": _DESTINATION_QUICK_REPLIES.get(
+                        context.slots.activity, _DEFAULT_DESTINATION_QUICK_REPLIES
+                    ),
+                    "collecting": "destination",
+                    "context": context
+                }
             return {
                 "action": "clarify",
-                "question": "Great! Here are some wonderful destinations:",
-                "quick_replies": all_destinations[:8],
+                "question": "Where would you like to go?",
+                "quick_replies": _STARTER_DESTINATIONS,
                 "collecting": "destination",
                 "context": context
             }
         
-        if context.slots["activity"]:
-            suggestions = get_destinations_for_activity(context.slots["activity"])
-            suggestions.append("Somewhere else")
+        case ConversationState.NEED_DATES:
+            dest = context.slots.destination
             return {
                 "action": "clarify",
-                "question": "Perfect! Where would you like to go?",
-                "quick_replies": suggestions[:6],
-                "collecting": "destination",
+                "question": f"When are you thinking for {dest}?",
+                "quick_replies": _DATE_OPTIONS,
+                "collecting": "dates",
                 "context": context
             }
-        else:
+        
+        case ConversationState.NEED_GUESTS:
             return {
                 "action": "clarify",
-                "question": "Where would you like to go?",
-                "quick_replies": ["San Diego", "Lake Tahoe", "Napa", "Big Sur", "Somewhere else"],
-                "collecting": "destination",
+                "question": "How many people will be joining?",
+                "quick_replies": _GUEST_OPTIONS,
+                "collecting": "guests",
                 "context": context
             }
     
-    # Ask for dates
-    if "dates" in missing:
-        dest = context.slots["destination"]
-        return {
-            "action": "clarify",
-            "question": f"When are you thinking for {dest}?",
-            "quick_replies": ["This weekend", "Next weekend", "I have specific dates"],
-            "collecting": "dates",
-            "context": context
-        }
-    
-    # Ask for party size
-    if "guests" in missing:
-        return {
-            "action": "clarify",
-            "question": "How many people will be joining?",
-            "quick_replies": ["Just me", "2 people", "3-4 people", "5-6 people", "Large group (7+)"],
-            "collecting": "guests",
-            "context": context
-        }
-    
     return {"action": "search", "context": context}
 
-def resolve_date_input(date_str: str) -> tuple:
-    """Convert user input to check_in, check_out dates with fuzzy matching"""
+def _weekend_pair(today, days_to_friday: tuple[int, ...]) -> tuple[str, str]:
+    """Friday-Sunday ISO dates, given a per-weekday offset table"""
+    check_in = today + timedelta(days=days_to_friday[today.weekday()])
+    check_out = check_in + timedelta(days=2)
+    return check_in.isoformat(), check_out.isoformat()
+
+def resolve_date_input(date_str: str, msg_lower: Optional[str] = None) -> tuple:
+    """
+    Convert user input to check_in, check_out dates with fuzzy matching.
+    msg_lower is date_str already lowercased and stripped, when the caller has it.
+    """
     today = datetime.now(PACIFIC).date()
-    msg = date_str.lower().strip()
+    msg = msg_lower if msg_lower is not None else date_str.lower().strip()
     
     # Handle simple presets
     if "this weekend" in msg:
-        days_until_fri = (4 - today.weekday()) % 7
-        if days_until_fri == 0 and datetime.now(PACIFIC).hour >= 12:
-            days_until_fri = 7
-        check_in = today + timedelta(days=days_until_fri if days_until_fri > 0 else 7)
-        check_out = check_in + timedelta(days=2)
-        return check_in.isoformat(), check_out.isoformat()
+        return _weekend_pair(today, _DAYS_TO_THIS_FRIDAY)
     
     elif "next weekend" in msg:
-        days_until_fri = (4 - today.weekday()) % 7
-        check_in = today + timedelta(days=days_until_fri + 7)
-        check_out = check_in + timedelta(days=2)
-        return check_in.isoformat(), check_out.isoformat()
-    
-    # Parse custom dates with fuzzy month matching
-    import re
-    from dateutil.parser import parse as parse_date
-    
-    # Fuzzy month matching (handles typos)
-    month_map = {
-        "jan": "January", "januar": "January", "january": "January",
-        "feb": "February", "februar": "February", "february": "February",
-        "mar": "March", "march": "March",
-        "apr": "April", "april": "April",
-        "may": "May",
-        "jun": "June", "june": "June",
-        "jul": "July", "july": "July",
-        "aug": "August", "august": "August",
-        "sep": "September", "sept": "September", "september": "September",
-        "oct": "October", "october": "October",
-        "nov": "November", "novem": "November", "november": "November",
-        "dec": "December", "decem": "December", "december": "December"
-    }
+        return _weekend_pair(today, _DAYS_TO_NEXT_FRIDAY)
     
+    # Parse custom dates with fuzzy month matching (handles typos)
     # Try pattern: "Month Day-Day" (e.g., "Januar 1-15", "Nov 15-17")
-    range_pattern = r'([a-z]+)\s+(\d+)\s*[-–]\s*(\d+)'
-    match = re.search(range_pattern, msg)
+    match = _MONTH_RANGE_RE.search(msg)
     
     if match:
         try:
-            month_input = match.group(1).lower()
+            month_input = match.group(1)
             start_day = int(match.group(2))
             end_day = int(match.group(3))
             
-            # Fuzzy match the month
-            month_name = None
-            for key, value in month_map.items():
-                if month_input.startswith(key[:3]):  # Match first 3 letters
-                    month_name = value
-                    break
-            
-            if not month_name:
-                # Try exact match
-                for key, value in month_map.items():
-                    if key in month_input:
-                        month_name = value
-                        break
+            # Fuzzy match the month on its first three letters ("Januar", "Novem", "Sept")
+            month_name = _MONTH_BY_PREFIX.get(month_input[:3])
             
             if month_name:
-                # Parse dates
-                check_in = parse_date(f"{month_name} {start_day} {today.year}")
-                check_out = parse_date(f"{month_name} {end_day} {today.year}")
+                # We built these strings ourselves, so a fixed format is enough
+                check_in = datetime.strptime(f"{month_name} {start_day} {today.year}", "%B %d %Y")
+                check_out = datetime.strptime(f"{month_name} {end_day} {today.year}", "%B %d %Y")
                 
                 # If dates are in the past, assume next year
                 if check_in.date() < today:
@@ -241,8 +286,7 @@ def resolve_date_input(date_str: str) -> tuple:
             print(f"Date parsing error: {e}")
     
     # Try numerical format: "1/15-1/17", "01/15-01/17"
-    numeric_pattern = r'(\d{1,2})/(\d{1,2})\s*[-–]\s*(\d{1,2})/(\d{1,2})'
-    match = re.search(numeric_pattern, msg)
+    match = _NUMERIC_RANGE_RE.search(msg)
     
     if match:
         try:
@@ -264,33 +308,23 @@ def resolve_date_input(date_str: str) -> tuple:
     
     # Default to next weekend if all parsing fails
     print(f"Could not parse date: {date_str}, defaulting to next weekend")
-    days_until_fri = (4 - today.weekday()) % 7
-    check_in = today + timedelta(days=days_until_fri if days_until_fri > 0 else 7)
-    check_out = check_in + timedelta(days=2)
-    return check_in.isoformat(), check_out.isoformat()
+    return _weekend_pair(today, _DAYS_TO_THIS_FRIDAY)
 
 
-def parse_guest_count(guest_str: str) -> int:
-    """Extract guest count from user input"""
-    msg = guest_str.lower()
-    if "just me" in msg or "solo" in msg or "1" in msg:
-        return 1
-    elif "2" in msg or "two" in msg or "couple" in msg:
-        return 2
-    elif "3" in msg or "three" in msg or "3-4" in msg:
-        return 3
-    elif "4" in msg or "four" in msg:
-        return 4
-    elif "5" in msg or "five" in msg or "5-6" in msg:
-        return 5
-    elif "6" in msg or "six" in msg:
-        return 6
-    elif "large" in msg or "7+" in msg or "7" in msg:
-        return 8
+def parse_guest_count(guest_str: str, msg_lower: Optional[str] = None) -> int:
+    """Extract guest count from user input; msg_lower skips re-lowercasing it"""
+    msg = msg_lower if msg_lower is not None else guest_str.lower()
+    word = _GUEST_WORD_RE.search(msg)
+    if word:
+        return _GUEST_WORD_COUNTS[word.group(1)]
     
-    import re
-    numbers = re.findall(r'\d+', msg)
-    if numbers:
-        return int(numbers[0])
+    # The first number wins, so "3-4 people" is 3 and "13 people" is 13
+    number = _NUMBER_RE.search(msg)
+    if number:
+        return clamp_guest_count(int(number.group()))
     
     return 2
+
+def clamp_guest_count(count: int) -> int:
+    """Keep a stated party size within what a single booking can hold"""
+    return min(max(count, 1), _MAX_GUESTS)
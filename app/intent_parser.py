@@ -2,9 +2,52 @@ from __future__ import annotations
 import re
 from typing import Dict, Any
 from datetime import datetime, timedelta
-from dateutil import tz
+from zoneinfo import ZoneInfo
 
-PACIFIC = tz.gettz("America/Los_Angeles")
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+_DESTINATIONS = (
+    "tahoe", "lake tahoe", "south lake tahoe", "north lake tahoe",
+    "san diego", "la jolla", "coronado",
+    "napa", "napa valley", "sonoma",
+    "big sur", "carmel", "monterey",
+    "santa barbara", "santa cruz",
+    "joshua tree", "palm springs",
+    "yosemite", "mammoth", "mammoth lakes",
+    "san francisco", "oakland", "berkeley",
+    "los angeles", "malibu", "venice",
+)
+# Longest names first so "south lake tahoe" wins over "tahoe" at the same spot;
+# between separate mentions the earlier entry in the table wins
+_DEST_RE = re.compile(
+    "|".join(re.escape(dest) for dest in sorted(_DESTINATIONS, key=len, reverse=True))
+)
+_DEST_RANK = {dest: rank for rank, dest in enumerate(_DESTINATIONS)}
+
+_ACTIVITIES = {
+    "ski": ("ski", "skiing", "snowboard"),
+    "beach": ("beach", "ocean", "surf", "coastal"),
+    "wine": ("wine", "vineyard", "winery", "tasting"),
+    "hiking": ("hike", "hiking", "trail", "outdoor"),
+    "city": ("city", "urban", "downtown", "nightlife"),
+}
+# One pass over the message; the named group that matched is the activity.
+# Activities rank in table order (ski > beach > wine > hiking > city),
+# whatever order their keywords appear in the message.
+_ACTIVITY_RE = re.compile(
+    "|".join(
+        f"(?P<{activity}>{'|'.join(re.escape(kw) for kw in keywords)})"
+        for activity, keywords in _ACTIVITIES.items()
+    )
+)
+_ACTIVITY_RANK = {activity: rank for rank, activity in enumerate(_ACTIVITIES)}
+
+# Days from each weekday (Mon=0) to the coming Friday; a Friday rolls to next week
+_DAYS_TO_FRIDAY = tuple((4 - weekday) % 7 or 7 for weekday in range(7))
+
+_PARTY_RE = re.compile(r'(\d+)\s*(people|guests|adults|person)')
+_UNDER_RE = re.compile(r'under\s*\$?(\d+)')
+_BUDGET_RE = re.compile(r'budget\s*\$?(\d+)')
 
 def parse_intent(message: str) -> Dict[str, Any]:
     """Extract destination, activity, dates, guests, budget from message"""
@@ -19,36 +62,12 @@ def parse_intent(message: str) -> Dict[str, Any]:
     }
     
     # Destinations
-    destinations = [
-        "tahoe", "lake tahoe", "south lake tahoe", "north lake tahoe",
-        "san diego", "la jolla", "coronado",
-        "napa", "napa valley", "sonoma",
-        "big sur", "carmel", "monterey",
-        "santa barbara", "santa cruz",
-        "joshua tree", "palm springs",
-        "yosemite", "mammoth", "mammoth lakes",
-        "san francisco", "oakland", "berkeley",
-        "los angeles", "malibu", "venice",
-    ]
-    
-    for dest in destinations:
-        if dest in msg:
-            intent["destination"] = dest.title()
-            break
+    destination = _ranked_match(_DEST_RE, msg, _DEST_RANK, lambda m: m.group())
+    if destination:
+        intent["destination"] = destination.title()
     
     # Activities
-    activities = {
-        "ski": ["ski", "skiing", "snowboard"],
-        "beach": ["beach", "ocean", "surf", "coastal"],
-        "wine": ["wine", "vineyard", "winery", "tasting"],
-        "hiking": ["hike", "hiking", "trail", "outdoor"],
-        "city": ["city", "urban", "downtown", "nightlife"],
-    }
-    
-    for activity, keywords in activities.items():
-        if any(kw in msg for kw in keywords):
-            intent["activity"] = activity
-            break
+    intent["activity"] = _ranked_match(_ACTIVITY_RE, msg, _ACTIVITY_RANK, lambda m: m.lastgroup)
     
     # Dates
     if "this weekend" in msg:
@@ -67,28 +86,34 @@ def parse_intent(message: str) -> Dict[str, Any]:
         intent["check_out"] = co.isoformat()
     
     # Party size
-    match = re.search(r'(\d+)\s*(people|guests|adults|person)', msg)
+    match = _PARTY_RE.search(msg)
     if match:
         intent["guests"] = int(match.group(1))
     
     # Budget
-    match = re.search(r'under\s*\$?(\d+)', msg)
+    match = _UNDER_RE.search(msg)
     if match:
         intent["budget_max"] = float(match.group(1))
-    match = re.search(r'budget\s*\$?(\d+)', msg)
+    match = _BUDGET_RE.search(msg)
     if match:
         intent["budget_max"] = float(match.group(1))
     
     return intent
 
+def _ranked_match(pattern, msg, rank, key):
+    """Highest-ranked key(match) over every match of pattern in msg, or None"""
+    best = None
+    for match in pattern.finditer(msg):
+        found = key(match)
+        if best is None or rank[found] < rank[best]:
+            best = found
+            if rank[best] == 0:
+                break
+    return best
+
 def _resolve_next_weekend():
     """Return next Friday-Sunday"""
     today = datetime.now(PACIFIC).date()
-    days_until_fri = (4 - today.weekday()) % 7
-    
-    if days_until_fri == 0 and datetime.now(PACIFIC).hour >= 18:
-        days_until_fri = 7
-    
-    check_in = today + timedelta(days=days_until_fri if days_until_fri > 0 else 7)
+    check_in = today + timedelta(days=_DAYS_TO_FRIDAY[today.weekday()])
     check_out = check_in + timedelta(days=2)
     return check_in, check_out
@@ -17,6 +17,11 @@ except ImportError as exc:  # pragma: no cover - dependency guard
 else:
     _import_error = None
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
 
 class LLMNotConfiguredError(RuntimeError):
     """Raised when the LLM client cannot be initialized due to missing config."""
@@ -50,6 +55,18 @@ def _ensure_model() -> GenerativeModel:
     return _model_instance
 
 
+def _dumps_prompt(prompt: Dict[str, Any]) -> str:
+    """Serialise the prompt as indented JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(prompt, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(prompt, indent=2)
+
+
+def is_configured() -> bool:
+    """Return True when the vertexai SDK is importable and a GCP project is set."""
+    return vertexai is not None and GenerativeModel is not None and bool(os.getenv("GCP_PROJECT"))
+
+
 def generate_brand_response(payload: Dict[str, Any]) -> str:
     """
     Generate upbeat, on-brand copy via Gemini using the provided itinerary payload.
@@ -87,7 +104,7 @@ def generate_brand_response(payload: Dict[str, Any]) -> str:
 
     try:
         response = model.generate_content(
-            json.dumps(prompt, indent=2),
+            _dumps_prompt(prompt),
             generation_config=GenerationConfig(
                 max_output_tokens=2048,
                 temperature=0.65,
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -10,7 +11,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from .models import ChatRequest, ChatResponse
 from .state import STORE
-from .agent_v2 import process_message
+from .agent_v2 import process_message_async
 
 app = FastAPI(title="Ferris MVP", version="2.0.0")
 
@@ -25,26 +26,30 @@ app.add_middleware(
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 VIDEO_FILE = Path("1739010-hd_1920_1080_30fps.mp4")
+INDEX_FILE = Path("static/index.html")
 
 @app.get("/healthz")
 def healthz():
     return {"ok": True, "version": "2.0.0"}
 
-@app.get("/", response_class=HTMLResponse)
-def landing():
+@lru_cache(maxsize=1)
+def _index_html() -> str:
+    # The page is static; read it once. A missing file raises and isn't cached.
+    return INDEX_FILE.read_text(encoding="utf-8")
+
+def _demo_page() -> HTMLResponse:
     try:
-        with open("static/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(f.read())
+        return HTMLResponse(_index_html())
     except FileNotFoundError:
         return HTMLResponse("<h1>Demo not found</h1>", status_code=404)
 
+@app.get("/", response_class=HTMLResponse)
+def landing():
+    return _demo_page()
+
 @app.get("/demo", response_class=HTMLResponse)
 def demo():
-    try:
-        with open("static/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(f.read())
-    except FileNotFoundError:
-        return HTMLResponse("<h1>Demo not found</h1>", status_code=404)
+    return _demo_page()
 
 @app.get("/background-video")
 def background_video():
@@ -81,6 +86,6 @@ async def chat(req: ChatRequest):
             needed=[]
         )
     
-    result = process_message(message, session)
+    result = await process_message_async(message, session)
     
     return ChatResponse(**result)
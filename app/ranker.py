@@ -1,7 +1,15 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import heapq
 import math
 
+AIRPORTS = {
+    "SFO": (37.6213, -122.3790),
+    "OAK": (37.7126, -122.2197),
+    "LAX": (33.9416, -118.4085),
+    "SAN": (32.7338, -117.1933),
+}
+
 def haversine(lat1, lon1, lat2, lon2) -> float:
     """Calculate distance between two points in km"""
     R = 6371.0
@@ -12,36 +20,56 @@ def haversine(lat1, lon1, lat2, lon2) -> float:
     c = 2*math.atan2(math.sqrt(a), math.sqrt(1-a))
     return R*c
 
-def rank_listings(listings: List[Dict[str, Any]], intent: Dict[str, Any], origin: str = "SFO") -> List[Dict[str, Any]]:
-    """Score and rank listings based on intent"""
-    
-    AIRPORTS = {
-        "SFO": (37.6213, -122.3790),
-        "OAK": (37.7126, -122.2197),
-        "LAX": (33.9416, -118.4085),
-        "SAN": (32.7338, -117.1933),
-    }
+def haversine_batch(lat1, lon1, points) -> List[float]:
+    """Distances in km from one origin to many (lat, lon) points"""
+    R = 6371.0
+    radians, sin, cos, atan2, sqrt = math.radians, math.sin, math.cos, math.atan2, math.sqrt
+    # Origin terms are shared by every point; same formula as haversine()
+    cos_p1 = cos(radians(lat1))
+    distances = []
+    for lat2, lon2 in points:
+        dphi = radians(lat2 - lat1)
+        dlambda = radians(lon2 - lon1)
+        a = sin(dphi/2)**2 + cos_p1*cos(radians(lat2))*sin(dlambda/2)**2
+        distances.append(R*2*atan2(sqrt(a), sqrt(1-a)))
+    return distances
+
+def rank_listings(
+    listings: List[Dict[str, Any]],
+    intent: Dict[str, Any],
+    origin: str = "SFO",
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Score and rank listings based on intent; limit keeps only the top N"""
     
     origin_coords = AIRPORTS.get(origin.upper(), AIRPORTS["SFO"])
     
+    # Intent values are loop invariants; read them once rather than per listing
+    nights = intent.get("nights") or 2
+    budget_max = intent.get("budget_max")
+    guests = intent.get("guests", 2)
+    
+    # Too-small listings are dropped before any scoring or distance math
+    candidates = [listing for listing in listings if listing["guests_max"] >= guests]
+    distances = haversine_batch(
+        origin_coords[0], origin_coords[1], [listing["coords"] for listing in candidates]
+    )
+    
+    # Rows are (-score, total_price, position, listing): best score first, cheaper
+    # stay breaks ties, position keeps input order and never compares listings
     scored = []
-    for listing in listings:
+    for position, (listing, dist_km) in enumerate(zip(candidates, distances)):
         score = 100.0
         
-        nights = intent.get("nights") or 2
         price_per_night = listing.get("price_per_night") or 0
         total_price = price_per_night * nights
         
         # Budget fit
-        if intent.get("budget_max"):
-            if total_price > intent["budget_max"]:
-                score -= min(50, (total_price - intent["budget_max"]) / 20)
+        if budget_max:
+            if total_price > budget_max:
+                score -= min(50, (total_price - budget_max) / 20)
             else:
-                score += (intent["budget_max"] - total_price) / 50
-        
-        # Guest capacity
-        if listing["guests_max"] < intent.get("guests", 2):
-            continue
+                score += (budget_max - total_price) / 50
         
         # Rating boost
         rating = listing.get("rating") or 0
@@ -50,10 +78,6 @@ def rank_listings(listings: List[Dict[str, Any]], intent: Dict[str, Any], origin
         score += min(10, review_count / 10)
         
         # Distance preference
-        dist_km = haversine(
-            origin_coords[0], origin_coords[1],
-            listing["coords"][0], listing["coords"][1]
-        )
         if dist_km < 200:
             score += 10
         elif dist_km > 800:
@@ -63,12 +87,12 @@ def rank_listings(listings: List[Dict[str, Any]], intent: Dict[str, Any], origin
         score += (listing.get("beds") or 0) * 2
         score += (listing.get("baths") or 0) * 3
         
-        scored.append({
-            "score": score,
-            "total_price": total_price,
-            "listing": listing
-        })
+        scored.append((-score, total_price, position, listing))
     
-    scored.sort(key=lambda x: (-x["score"], x["total_price"]))
+    if limit is not None:
+        # Partial selection beats a full sort when the caller wants a handful
+        scored = heapq.nsmallest(limit, scored)
+    else:
+        scored.sort()
     
-    return [item["listing"] for item in scored]
+    return [row[3] for row in scored]
@@ -1,32 +1,58 @@
 from __future__ import annotations
-from typing import Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from .models import SessionSlots
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     session_id: str
     slots: SessionSlots = field(default_factory=SessionSlots)
     state: str = "COLLECTING_SLOTS"
     last_itinerary: Optional[dict] = None
+    # Conversation state the agent fills in lazily (see agent_v2)
+    conversation_context: Any = None
+    profile: Optional[dict] = None
+    last_user_message: str = ""
+    listings_cache: Optional[OrderedDict] = None
+    refinement_views: Optional[tuple] = None
+    # Turns run in worker threads; this keeps two turns for one session from
+    # mutating the fields above at the same time
+    turn_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
 class MemoryStore:
-    def __init__(self):
-        self.sessions: Dict[str, Session] = {}
-        self.holds: Dict[str, dict] = {}
+    """In-process sessions and holds, each capped with least-recently-used eviction."""
+
+    def __init__(self, max_sessions: int = 10_000, max_holds: int = 10_000):
+        self.sessions: OrderedDict[str, Session] = OrderedDict()
+        self.holds: OrderedDict[str, dict] = OrderedDict()
+        self.max_sessions = max_sessions
+        self.max_holds = max_holds
+        self._lock = threading.Lock()
 
     def get_session(self, session_id: Optional[str]) -> Session:
         sid = session_id or "default"
-        if sid not in self.sessions:
-            self.sessions[sid] = Session(session_id=sid)
-        return self.sessions[sid]
+        with self._lock:
+            session = self.sessions.get(sid)
+            if session is None:
+                session = self.sessions[sid] = Session(session_id=sid)
+                if len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(sid)
+            return session
 
     def place_hold(self, itinerary_id: str) -> dict:
         hold_id = f"HOLD_{itinerary_id}"
         expires_at = (datetime.utcnow() + timedelta(hours=24)).isoformat() + "Z"
         hold = {"hold_id": hold_id, "expires_at": expires_at, "itinerary_id": itinerary_id}
-        self.holds[hold_id] = hold
+        with self._lock:
+            self.holds[hold_id] = hold
+            self.holds.move_to_end(hold_id)
+            if len(self.holds) > self.max_holds:
+                self.holds.popitem(last=False)
         return hold
 
 STORE = MemoryStore()
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import json
+import sys
+from functools import lru_cache
+from itertools import product
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 DATA_DIR = Path(__file__).resolve().parent.parent
 
-_ROUTES_STATIC: Dict[Tuple[str, str], List[Dict[str, str]]] = {
+_ROUTES_STATIC: Dict[Tuple[str, str], Tuple[Dict[str, str], ...]] = {
     (
         "Berkeley, CA",
         "Lake Tahoe",
-    ): [
+    ): (
         {
             "label": "Drive via I-80 E",
             "mode": "car",
@@ -35,41 +38,60 @@ _ROUTES_STATIC: Dict[Tuple[str, str], List[Dict[str, str]]] = {
             "cost": "$79 round-trip",
             "highlights": "Includes snacks and gear storage; relax the entire way.",
         },
-    ]
+    )
 }
 
-_TRANSPORT_CACHE: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+_ROUTES_STATIC_LOWER: Tuple[Tuple[str, str, Tuple[Dict[str, str], ...]], ...] = tuple(
+    (sys.intern(key_origin.lower()), sys.intern(key_dest.lower()), options)
+    for (key_origin, key_dest), options in _ROUTES_STATIC.items()
+)
+
+_TRANSPORT_CACHE: Dict[Tuple[str, str], Tuple[Dict[str, str], ...]] = {}
+# Same routes as _TRANSPORT_CACHE, keyed by the lowercased (origin, destination)
+# pair so lookups never re-lowercase the catalog.
+_TRANSPORT_INDEX: Dict[Tuple[str, str], Tuple[Dict[str, str], ...]] = {}
 _TRANSPORT_LOADED = False
 
 
-def get_transportation_options(origin: str, destination: str) -> List[Dict[str, str]]:
-    _ensure_transport_loaded()
+def get_transportation_options(origin: str, destination: str) -> Tuple[Dict[str, str], ...]:
+    return _lookup_routes(origin, destination)
+
 
+@lru_cache(maxsize=512)
+def _lookup_routes(origin: str, destination: str) -> Tuple[Dict[str, str], ...]:
     origin_lower = origin.lower()
     destination_lower = destination.lower()
 
-    for key, options in _TRANSPORT_CACHE.items():
-        key_origin, key_dest = key
-        if key_origin.lower() == origin_lower and (
-            key_dest.lower() in destination_lower or destination_lower in key_dest.lower()
-        ):
+    # Built-in routes need no catalog, so answer them before touching transport.json;
+    # results cached here stay valid once the catalog loads
+    for key_origin, key_dest, options in _ROUTES_STATIC_LOWER:
+        if key_origin == origin_lower and key_dest in destination_lower:
             return options
 
-    for key, options in _TRANSPORT_CACHE.items():
-        key_origin, key_dest = key
-        if key_dest.lower() in destination_lower or destination_lower in key_dest.lower():
+    _ensure_transport_loaded()
+
+    options = _TRANSPORT_INDEX.get((origin_lower, destination_lower))
+    if options is not None:
+        return options
+
+    # Either string may contain the other; only the shorter can fit inside the longer,
+    # so one containment test per key decides it
+    destination_len = len(destination_lower)
+    for (key_origin, key_dest), options in _TRANSPORT_INDEX.items():
+        if key_origin == origin_lower and (
+            key_dest in destination_lower if len(key_dest) <= destination_len else destination_lower in key_dest
+        ):
             return options
 
-    for key, options in _ROUTES_STATIC.items():
-        key_origin, key_dest = key
-        if key_origin.lower() == origin_lower and key_dest.lower() in destination_lower:
+    for (_, key_dest), options in _TRANSPORT_INDEX.items():
+        if (key_dest in destination_lower) if len(key_dest) <= destination_len else (destination_lower in key_dest):
             return options
 
     generic_key = (origin, destination.split(" ·")[0]) if " ·" in destination else None
     if generic_key and generic_key in _ROUTES_STATIC:
         return _ROUTES_STATIC[generic_key]
 
-    return []
+    return ()
 
 
 def _ensure_transport_loaded() -> None:
@@ -86,7 +108,7 @@ def _load_transport_catalog(filename: str) -> None:
         return
 
     try:
-        raw = json.loads(data_path.read_text(encoding="utf-8"))
+        raw = json.loads(data_path.read_bytes())
     except json.JSONDecodeError:
         return
 
@@ -154,6 +176,9 @@ def _load_transport_catalog(filename: str) -> None:
         )
 
     if options:
+        # One shared tuple sits behind every key and every cached lookup, so callers
+        # cannot reorder or extend it
+        routes = tuple(options)
         origin_keys = {origin, origin.replace("California", "CA"), origin.replace(", California", ", CA")}
         destination_keys = {
             destination,
@@ -163,33 +188,42 @@ def _load_transport_catalog(filename: str) -> None:
         origin_keys = {key.strip() for key in origin_keys if key}
         destination_keys = {key.strip() for key in destination_keys if key}
 
-        for ok in origin_keys:
-            for dk in destination_keys:
-                _TRANSPORT_CACHE[(ok, dk)] = options
+        pairs = list(product(origin_keys, destination_keys))
+        _TRANSPORT_CACHE.update((pair, routes) for pair in pairs)
+        _TRANSPORT_INDEX.update(
+            ((sys.intern(ok.lower()), sys.intern(dk.lower())), routes) for ok, dk in pairs
+        )
+
+
+_NO_ENTRY = object()
 
 
 def _select_recommended(entries, default=None):
     if not entries:
         return default
-    if isinstance(entries, dict):
-        entries = list(entries.values())
-    elif not isinstance(entries, (list, tuple)):
-        entries = list(entries)
-    if not entries:
+    items = iter(entries.values() if isinstance(entries, dict) else entries)
+    first = next(items, _NO_ENTRY)
+    if first is _NO_ENTRY:
         return default
-    for item in entries:
+    if isinstance(first, dict) and first.get("recommended"):
+        return first
+    for item in items:
         if isinstance(item, dict) and item.get("recommended"):
             return item
-    return entries[0] if entries else default
+    return first
 
 
 def _format_cost(value) -> str:
     if value is None:
         return "See details"
-    try:
-        amount = float(value)
-    except (TypeError, ValueError):
-        return str(value)
-    if amount.is_integer():
-        amount = int(amount)
-    return f"${amount}"
+    kind = type(value)
+    if kind is int:
+        return f"${value}"
+    if kind is not float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return str(value)
+    if value.is_integer():
+        value = int(value)
+    return f"${value}"
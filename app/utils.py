@@ -1,19 +1,22 @@
 from __future__ import annotations
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Tuple, Optional
 import math
 import re
-from dateutil import tz
+from zoneinfo import ZoneInfo
 
-PACIFIC = tz.gettz("America/Los_Angeles")
+PACIFIC = ZoneInfo("America/Los_Angeles")
 
 def resolve_weekend(today: Optional[date] = None) -> Tuple[date, date]:
     """Return next Fri–Sun for America/Los_Angeles."""
     if today is None:
         today = datetime.now(PACIFIC).date()
+    return _weekend_for(today)
+
+@lru_cache(maxsize=32)
+def _weekend_for(today: date) -> Tuple[date, date]:
     days_until_fri = (4 - today.weekday()) % 7
-    if days_until_fri == 0 and datetime.now(PACIFIC).hour >= 18:
-        pass
     check_in = today + timedelta(days=days_until_fri)
     check_out = check_in + timedelta(days=2)
     return check_in, check_out
@@ -21,14 +24,21 @@ def resolve_weekend(today: Optional[date] = None) -> Tuple[date, date]:
 def iso_today_pacific() -> str:
     return datetime.now(PACIFIC).isoformat()
 
+# One pass finds every cue; "under" beats "budget" beats a bare "$" amount.
+_MONEY_RE = re.compile(r'(?:(under|budget)\s*\$?|\$)\s*(\d{2,5})', re.I)
+
 def parse_money(text: str) -> Optional[float]:
-    m = re.search(r'under\s*\$?\s*(\d{2,5})', text, re.I)
-    if m: return float(m.group(1))
-    m = re.search(r'budget\s*\$?\s*(\d{2,5})', text, re.I)
-    if m: return float(m.group(1))
-    m = re.search(r'\$\s*(\d{2,5})', text)
-    if m: return float(m.group(1))
-    return None
+    budget = dollar = None
+    for m in _MONEY_RE.finditer(text):
+        cue = m.group(1)
+        if cue is None:
+            if dollar is None: dollar = m.group(2)
+        elif cue.lower() == 'under':
+            return float(m.group(2))
+        elif budget is None:
+            budget = m.group(2)
+    amount = budget or dollar
+    return float(amount) if amount else None
 
 def haversine(lat1, lon1, lat2, lon2) -> float:
     R = 6371.0
@@ -36,5 +46,5 @@ def haversine(lat1, lon1, lat2, lon2) -> float:
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
     a = math.sin(dphi/2)**2 + math.cos(p1)*math.cos(p2)*math.sin(dlambda/2)**2
-    c = 2*math.atan2(math.sqrt(a), math.sqrt(1-a))
+    c = 2*math.asin(min(1.0, math.sqrt(a)))  # rounding can nudge a past 1 near antipodes
     return R*c
@@ -0,0 +1,12 @@
+from app.agent_v2 import _WORD_RE, auto_complete_missing_slots, update_context_from_message
+from app.conversation_flow import ConversationContext
+
+
+def context_after(message: str, auto_complete: bool = False) -> ConversationContext:
+    """Fresh context after one user turn, the way process_message prepares it"""
+    context = ConversationContext()
+    msg = message.lower().strip()
+    update_context_from_message(context, message, msg, frozenset(_WORD_RE.findall(msg)))
+    if auto_complete:
+        auto_complete_missing_slots(context)
+    return context
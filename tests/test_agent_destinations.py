@@ -0,0 +1,27 @@
+import unittest
+
+from app.agent_v2 import _fuzzy_destination
+from tests.helpers import context_after
+
+
+class FuzzyDestinationTests(unittest.TestCase):
+    def test_single_word_typo(self):
+        self.assertEqual(_fuzzy_destination("weekend in tahow"), "Lake Tahoe")
+
+    def test_multi_word_typos(self):
+        self.assertEqual(_fuzzy_destination("trip to los angelos"), "Los Angeles")
+        self.assertEqual(_fuzzy_destination("san fransisco for two"), "San Francisco")
+
+    def test_stop_word_window_is_not_a_place(self):
+        self.assertIsNone(_fuzzy_destination("in the city"))
+
+    def test_near_miss_phrase_is_not_a_place(self):
+        self.assertIsNone(_fuzzy_destination("big beer"))
+
+    def test_city_activity_keeps_its_default(self):
+        context = context_after("party of 7 people in the city", auto_complete=True)
+        self.assertEqual(context.slots.destination, "San Francisco")
+
+
+if __name__ == "__main__":
+    unittest.main()
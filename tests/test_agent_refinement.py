@@ -0,0 +1,18 @@
+import unittest
+
+from app.agent_v2 import _refinement_type
+
+
+class RefinementTypeTests(unittest.TestCase):
+    def test_cheaper_beats_an_earlier_different_cue(self):
+        self.assertEqual(_refinement_type("another cheaper one please"), "cheaper")
+
+    def test_bigger_beats_an_earlier_different_cue(self):
+        self.assertEqual(_refinement_type("something else with more beds"), "bigger")
+
+    def test_no_cue(self):
+        self.assertIsNone(_refinement_type("sounds great"))
+
+
+if __name__ == "__main__":
+    unittest.main()
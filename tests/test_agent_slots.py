@@ -0,0 +1,28 @@
+import unittest
+
+from tests.helpers import context_after
+
+
+class BudgetSlotTests(unittest.TestCase):
+    def test_budget_beats_an_earlier_under(self):
+        self.assertEqual(context_after("Joshua tree under $300 budget $900").slots.budget_max, 900.0)
+
+    def test_under_alone(self):
+        self.assertEqual(context_after("Joshua tree under $300").slots.budget_max, 300.0)
+
+
+class GuestSlotTests(unittest.TestCase):
+    def test_explicit_count_is_clamped(self):
+        self.assertEqual(context_after("party of 45 people").slots.guests, 20)
+
+    def test_keyword_count_is_clamped(self):
+        self.assertEqual(context_after("big family, 45 of us").slots.guests, 20)
+
+
+class DateSlotTests(unittest.TestCase):
+    def test_plural_weekend_sets_dates(self):
+        self.assertIsNotNone(context_after("weekends work best").slots.check_in)
+
+
+if __name__ == "__main__":
+    unittest.main()
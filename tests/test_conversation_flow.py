@@ -0,0 +1,38 @@
+import unittest
+
+from app.conversation_flow import ConversationContext
+
+
+class ExtractActivityTests(unittest.TestCase):
+    def setUp(self):
+        self.context = ConversationContext()
+
+    def assertActivity(self, message, activity):
+        self.assertEqual(self.context.extract_activity(message), activity, message)
+
+    def test_stems_cover_inflections(self):
+        for message, activity in (
+            ("snowy cabin with friends", "ski"),
+            ("we hiked all day", "hiking"),
+            ("surfers welcome", "beach"),
+            ("Beachfront condo", "beach"),
+            ("something beachy", "beach"),
+            ("beachside bungalow", "beach"),
+            ("hotels with spas", "relaxing"),
+            ("wellness retreats", "relaxing"),
+        ):
+            self.assertActivity(message, activity)
+
+    def test_phrases_match_as_phrases(self):
+        self.assertActivity("winter sports in tahoe", "ski")
+        self.assertActivity("wine country weekend", "wine")
+        self.assertActivity("winter getaway in napa", None)
+
+    def test_cues_do_not_match_inside_words(self):
+        self.assertActivity("whiskey bar", None)
+        self.assertActivity("thousand oaks", None)
+        self.assertActivity("spacious place", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
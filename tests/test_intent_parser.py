@@ -0,0 +1,23 @@
+import unittest
+
+from app.intent_parser import parse_intent
+
+
+class ParseIntentPriorityTests(unittest.TestCase):
+    def test_activity_priority_beats_mention_order(self):
+        for message, activity in (
+            ("beach or ski trip", "ski"),
+            ("wine tasting, then ski", "ski"),
+            ("downtown and beach", "beach"),
+        ):
+            self.assertEqual(parse_intent(message)["activity"], activity, message)
+
+    def test_destination_table_order_beats_mention_order(self):
+        self.assertEqual(parse_intent("sonoma or napa")["destination"], "Napa")
+
+    def test_longest_name_wins_at_the_same_spot(self):
+        self.assertEqual(parse_intent("south lake tahoe")["destination"], "South Lake Tahoe")
+
+
+if __name__ == "__main__":
+    unittest.main()